@@ -1,33 +1,97 @@
-import tkinter as tk
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+import time
 from datetime import datetime
 import webbrowser
 
-def countdown():
-    target_time = datetime(2026, 4, 8, 8, 30, 0) # 8th of April: Art 1 & 2
-    now = datetime.now()
-    remaining = target_time - now
-
-    # Check if the target time has passed
-    if remaining.total_seconds() <= 0:
-        # If time is up or passed, display all zeros
-        days = 0
-        hours = 0
-        minutes = 0
-        seconds = 0
-    else:
-        # Calculate remaining time as usual
-        days = remaining.days
-        hours, remainder = divmod(remaining.seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-    
-    # Update the label with the formatted time
-    label.config(text=f"{days} days {hours:02d}h {minutes:02d}m {seconds:02d}s")
-    
-    # Continue the countdown if there's still time remaining, or if it's 0 to keep displaying zeros
-    if remaining.total_seconds() > 0:
-        label.after(1000, countdown)
-    # If total_seconds is 0 or less, we stop calling countdown() after this update.
-    # The label will remain showing "0 days 00h 00m 00s".
+# Papers to count down to: CSV (start,paper) or JSON ([{"start": ..., "paper": ...}])
+TIMETABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "timetable.csv")
+
+# Used when there is no timetable file
+target_time = datetime(2026, 4, 8, 8, 30, 0) # 8th of April: Art 1 & 2
+
+# how many upcoming papers to show at once
+SHOW_NEXT = 3
+
+
+def format_remaining(remaining_seconds):
+    """Formats whole remaining seconds as 'D days HHh MMm SSs' (all zeros once passed)."""
+    # If time is up or passed, display all zeros
+    remaining_seconds = max(0, remaining_seconds)
+    days, remainder = divmod(remaining_seconds, 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{days} days {hours:02d}h {minutes:02d}m {seconds:02d}s"
+
+
+def load_timetable(path=TIMETABLE_FILE):
+    """
+    Reads [(start datetime, paper name), ...] from a CSV or JSON timetable.
+    CSV lines starting with '#' are comments.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(line for line in f if not line.lstrip().startswith("#")))
+    return [(datetime.fromisoformat(row["start"].strip()), row["paper"].strip()) for row in rows]
+
+
+class Ticker:
+    """
+    Tick logic shared by the window and the headless mode.
+
+    Upcoming papers are kept in a heap ordered by start time; the first
+    `show` of them are displayed and a paper is dropped as soon as it
+    starts, so the next one moves up. The remaining time is recomputed
+    from the wall clock on every tick, so suspend/resume or a clock change
+    is picked up at the next tick; callback latency never accumulates
+    because each tick computes the delay to the exact moment a displayed
+    second changes (the timer that waits for it runs on a monotonic clock).
+    """
+
+    def __init__(self, events, show=SHOW_NEXT, wall_clock=time.time):
+        self.wall_clock = wall_clock
+        self.show = show
+        self.heap = [(start.timestamp(), paper) for start, paper in events]
+        heapq.heapify(self.heap)
+        self.last = None  # most recently started paper, shown at zero when nothing is left
+        self.lines = None
+
+    def tick(self):
+        """
+        Returns (lines, delay_ms): lines is the new text of every displayed
+        countdown, or None if nothing changed since the last tick; delay_ms
+        is when to tick next, or None once every paper has started.
+        """
+        now = self.wall_clock()
+        while self.heap and self.heap[0][0] <= now:
+            self.last = heapq.heappop(self.heap)
+
+        shown = heapq.nsmallest(self.show, self.heap) or ([self.last] if self.last else [])
+        lines = tuple(f"{paper}: {format_remaining(math.floor(start - now))}" for start, paper in shown)
+        changed = lines if lines != self.lines else None
+        self.lines = lines
+        if not self.heap:
+            return changed, None
+        # Wake up just after the next second boundary of any displayed countdown
+        delay = min((start - now) % 1 for start, _ in shown)
+        return changed, int(delay * 1000) + 1
+
+
+def run_headless(ticker, out=print, sleep=time.sleep):
+    """Same countdown without Tk: prints the text whenever it changes."""
+    while True:
+        lines, delay = ticker.tick()
+        if lines is not None:
+            out(" | ".join(lines))
+        if delay is None:
+            break
+        sleep(delay / 1000)
 
 
 def open_schedule():
@@ -35,15 +99,63 @@ def open_schedule():
     url = "https://www.hkeaa.edu.hk/doclibrary/hkdse/exam_timetable/2026_dse_timetable.pdf"
     webbrowser.open_new(url)
 
-root = tk.Tk()
-root.title("2026 DSE Countdown")
 
-label = tk.Label(root, text="", font=("Helvetica", 24))
-label.pack(padx=20, pady=2)
+def run_window(ticker):
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.title("2026 DSE Countdown")
+
+    # One label per displayed paper, the next paper in the largest font
+    labels = []
+    for i in range(ticker.show):
+        label = tk.Label(root, text="", font=("Helvetica", 24 if i == 0 else 14))
+        label.pack(padx=20, pady=2)
+        labels.append(label)
+
+    schedule_button = tk.Button(root, text="Timetable", command=open_schedule)
+    schedule_button.pack(pady=10)
+
+    pending = [None]  # id of the scheduled tick
+
+    def countdown():
+        pending[0] = None
+        lines, delay = ticker.tick()
+        # One timer drives every label; only touch labels whose text changed
+        if lines is not None:
+            for i, label in enumerate(labels):
+                text = lines[i] if i < len(lines) else ""
+                if label.cget("text") != text:
+                    label.config(text=text)
+        # Stop once every paper has started; the last one keeps showing zeros
+        if delay is not None:
+            pending[0] = root.after(delay, countdown)
 
-schedule_button = tk.Button(root, text="Timetable", command=open_schedule)
-schedule_button.pack(pady=10)
+    def on_unmap(event):
+        # Minimised: stop waking up until the window is shown again
+        if event.widget is root and pending[0] is not None:
+            root.after_cancel(pending[0])
+            pending[0] = None
 
-countdown()
+    def on_map(event):
+        if event.widget is root and pending[0] is None:
+            countdown()
 
-root.mainloop()
\ No newline at end of file
+    root.bind("<Unmap>", on_unmap)
+    root.bind("<Map>", on_map)
+
+    countdown()
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    if os.path.exists(TIMETABLE_FILE):
+        events = load_timetable(TIMETABLE_FILE)
+    else:
+        events = [(target_time, "Art 1 & 2")]
+    ticker = Ticker(events)
+    if "--headless" in sys.argv:
+        run_headless(ticker)
+    else:
+        run_window(ticker)
@@ -1,5 +1,33 @@
 import random
-import pandas as pd
+import math
+import multiprocessing
+import os
+import csv
+import json
+from queue import Empty
+from statistics import NormalDist
+
+from solver import solve, named
+
+# Note: the vectorized engine needs numpy (pip install numpy);
+# without it the pure Python engine is used.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BOX = ['W', 'W', 'Y', 'Y', 'R', 'R', 'R']
+PLAYERS = ['Boy', 'Girl']
+STOP_BALLS = ['W', 'Y']
+
+TARGET = ('Girl', 'W')
+
+# Exact answer for every scenario (with replacement, like random.choice)
+EXACT = named(solve(BOX, STOP_BALLS, len(PLAYERS)), PLAYERS)
+TARGET_REFERENCE = float(EXACT[TARGET])
+
+# Seconds the parallel run waits for a chunk before checking its workers are alive
+WORKER_POLL = 5.0
 
 def run_simulation(num_trials):
     """
@@ -7,7 +35,7 @@ def run_simulation(num_trials):
     for the four possible game-ending scenarios.
     Box: 2 White (W), 2 Yellow (Y), 3 Red (R). Game ends on W or Y. Boy draws first.
     """
-    box = ['W', 'W', 'Y', 'Y', 'R', 'R', 'R']
+    box = BOX
     
     # Dictionary to store the counts for each scenario: (Player, Ball)
     scenario_counts = {
@@ -34,36 +62,188 @@ def run_simulation(num_trials):
 
     return scenario_counts
 
-def display_results(scenario_counts, num_trials):
-    """Formats and prints the simulation results with highlighting for the target case."""
-    
+def run_simulation_vectorized(num_trials, chunk_size=1_000_000, seed=None):
+    """
+    Same game as run_simulation, simulated in NumPy chunks.
+
+    Draws are with replacement, so each game is a run of independent draws:
+    the number of draws until the game ends is geometric with success
+    probability P(W or Y), the player is decided by that length (odd = Boy),
+    and the ending ball is a categorical draw among the stopping balls.
+    Counts are accumulated with np.bincount, so memory stays bounded by
+    chunk_size however many trials are run.
+    """
+    rng = np.random.default_rng(seed)
+    stop_weights = np.array([BOX.count(ball) for ball in STOP_BALLS], dtype=float)
+    p_stop = stop_weights.sum() / len(BOX)
+    stop_weights /= stop_weights.sum()
+
+    totals = np.zeros(len(PLAYERS) * len(STOP_BALLS), dtype=np.int64)
+    remaining = num_trials
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        game_length = rng.geometric(p_stop, size)
+        player = (game_length - 1) % len(PLAYERS)
+        ball = rng.choice(len(STOP_BALLS), size=size, p=stop_weights)
+        totals += np.bincount(player * len(STOP_BALLS) + ball, minlength=totals.size)
+        remaining -= size
+
+    return {
+        (player, ball): int(totals[i * len(STOP_BALLS) + j])
+        for i, player in enumerate(PLAYERS)
+        for j, ball in enumerate(STOP_BALLS)
+    }
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """Wilson score confidence interval for a binomial proportion."""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p_hat = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p_hat + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p_hat * (1 - p_hat) / trials + z * z / (4 * trials * trials)) / denom
+    return centre - half, centre + half
+
+def _simulation_worker(seed_seq, chunk_size, queue, stop_event):
+    """Simulates chunk after chunk with its own RNG stream and reports each
+    chunk's partial scenario_counts to the parent until told to stop."""
+    rng = np.random.default_rng(seed_seq)
+    while not stop_event.is_set():
+        queue.put(run_simulation_vectorized(chunk_size, chunk_size, seed=rng))
+    queue.put(None)  # this worker is done
+
+def run_simulation_parallel(tolerance, num_workers=None, chunk_size=1_000_000,
+                            max_trials=10**10, confidence=0.95, seed=None):
+    """
+    Runs the vectorized simulation in several processes until the target
+    probability is pinned down.
+
+    Every worker gets an independent RNG stream spawned from one SeedSequence
+    and streams partial counts back. The parent keeps a running Wilson
+    interval for the target case and stops the workers once the whole
+    interval lies within `tolerance` of TARGET_REFERENCE (or max_trials is
+    reached). Returns (scenario_counts, num_trials).
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    seed_seqs = np.random.SeedSequence(seed).spawn(num_workers)
+    queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    workers = [multiprocessing.Process(target=_simulation_worker, args=(ss, chunk_size, queue, stop_event))
+               for ss in seed_seqs]
+    for w in workers:
+        w.start()
+
+    scenario_counts = {(player, ball): 0 for player in PLAYERS for ball in STOP_BALLS}
+    num_trials = 0
+    running = len(workers)
+    try:
+        while running:
+            try:
+                partial = queue.get(timeout=WORKER_POLL)
+            except Empty:
+                # A worker that dies never sends its None; don't wait for it forever
+                for w in workers:
+                    if w.exitcode not in (None, 0):
+                        raise RuntimeError(f"Simulation worker {w.pid} died (exit code {w.exitcode}).")
+                if not any(w.is_alive() for w in workers):
+                    raise RuntimeError("Simulation workers exited without reporting back.")
+                continue
+            if partial is None:
+                running -= 1
+                continue
+            for key, count in partial.items():
+                scenario_counts[key] += count
+            num_trials += sum(partial.values())
+
+            if stop_event.is_set():
+                continue  # draining the chunks that were already in flight
+            low, high = wilson_interval(scenario_counts[TARGET], num_trials, confidence)
+            print(f"  {num_trials:>14,} trials: P{TARGET} = {scenario_counts[TARGET] / num_trials:.5f} "
+                  f"CI [{low:.5f}, {high:.5f}]")
+            converged = (TARGET_REFERENCE - tolerance <= low and high <= TARGET_REFERENCE + tolerance)
+            if converged or num_trials >= max_trials:
+                stop_event.set()
+    finally:
+        stop_event.set()
+        for w in workers:
+            # Workers still blocked on a full queue (after an error) are killed
+            w.join(timeout=WORKER_POLL)
+            if w.is_alive():
+                w.terminate()
+                w.join()
+
+    return scenario_counts, num_trials
+
+def check_against_exact(scenario_counts, num_trials, confidence=0.999):
+    """Scenarios whose exact probability lies outside the simulated Wilson interval."""
+    mismatches = []
+    for key, count in scenario_counts.items():
+        low, high = wilson_interval(count, num_trials, confidence)
+        if not low <= EXACT[key] <= high:
+            mismatches.append(key)
+    return mismatches
+
+def build_rows(scenario_counts, num_trials):
+    """Result rows (target case first, then by scenario name) as plain dicts."""
     data = []
     for (player, ball), count in scenario_counts.items():
         
         probability = count / num_trials
-        is_target = (player == 'Girl' and ball == 'W')
-        
-        # Add visual indicator for the target case
-        scenario_name = f"{player} draws {ball}" if is_target else f"{player} draws {ball}"
+        is_target = (player, ball) == TARGET
         
         data.append({
-            'Game Ending Scenario': scenario_name,
-            'No. of Cases (Count)': f"{count:,}",  # Format with thousands separator
-            'Empirical Probability': f"{probability:.4f}",
+            'Game Ending Scenario': f"{player} draws {ball}",
+            'No. of Cases (Count)': count,
+            'Empirical Probability': probability,
+            'Exact Probability': EXACT[(player, ball)],
             'Sort_Order': 0 if is_target else 1 # Used for sorting the target case to the top
         })
 
-    df_results = pd.DataFrame(data)
-    
-    # Sort and clean up the DataFrame
-    df_results = df_results.sort_values(by=['Sort_Order', 'Game Ending Scenario'], ascending=[True, True])
-    df_results = df_results.drop(columns=['Sort_Order'])
+    data.sort(key=lambda row: (row['Sort_Order'], row['Game Ending Scenario']))
+    for row in data:
+        del row['Sort_Order']
+    return data
+
+def format_table(rows):
+    """Plain-text table with right-aligned columns (same layout as DataFrame.to_string)."""
+    cells = [[f"{row['Game Ending Scenario']}",
+              f"{row['No. of Cases (Count)']:,}",  # Format with thousands separator
+              f"{row['Empirical Probability']:.4f}",
+              str(row['Exact Probability'])] for row in rows]
+    headers = list(rows[0].keys()) if rows else []
+    widths = [max([len(h)] + [len(c[i]) for c in cells]) for i, h in enumerate(headers)]
+    lines = [" ".join(h.rjust(w) for h, w in zip(headers, widths))]
+    lines += [" ".join(c.rjust(w) for c, w in zip(cell_row, widths)) for cell_row in cells]
+    return "\n".join(lines)
+
+def export_results(rows, path):
+    """Writes the rows to a .csv or .json file (chosen by extension)."""
+    plain = [{**row, 'Exact Probability': str(row['Exact Probability'])} for row in rows]
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(plain, f, indent=2)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(plain[0].keys()))
+            writer.writeheader()
+            writer.writerows(plain)
+
+def to_dataframe(rows):
+    """The rows as a pandas DataFrame; pandas is only imported when this is called."""
+    import pandas as pd
+    return pd.DataFrame(rows)
+
+def display_results(scenario_counts, num_trials, export_path=None):
+    """Formats and prints the simulation results with highlighting for the target case."""
+
+    rows = build_rows(scenario_counts, num_trials)
     
     # Print the table and summary
     print(f"Monte Carlo Simulation Results (Total Trials: {num_trials:,})\n")
-    print(df_results.to_string(index=False))
+    print(format_table(rows))
 
-    target_count = scenario_counts[('Girl', 'W')]
+    target_count = scenario_counts[TARGET]
     target_prob = target_count / num_trials
     
     print("\n" + "="*50)
@@ -71,14 +251,48 @@ def display_results(scenario_counts, num_trials):
     print("="*50)
     print(f"The number of times the Girl drew a White ball was: {target_count:,}")
     print(f"Empirical Probability: {target_count:,} / {num_trials:,} = {target_prob:.4f}")
-    print(f"(Theoretical Probability: 0.15 or 3/20)")
+    print(f"(Theoretical Probability: {TARGET_REFERENCE:.4f} or {EXACT[TARGET]})")
     print("="*50)
 
+    mismatches = check_against_exact(scenario_counts, num_trials)
+    if mismatches:
+        print("⚠ Outside the 99.9% interval of the exact solution: " + ", ".join(f"{p} draws {b}" for p, b in mismatches))
+    else:
+        print("All scenarios agree with the exact solution (99.9% interval).")
+
+    if export_path:
+        export_results(rows, export_path)
+        print(f"Results written to {export_path}")
+    return rows
+
 
 # --- User Control: Set the number of trials here ---
 NUM_TRIALS = 1000
+
+# "numpy" (vectorized, handles 10**8 trials) or "python" (one draw at a time)
+ENGINE = "numpy"
+
+# trials simulated per NumPy batch (bounds memory use)
+CHUNK_SIZE = 1_000_000
+
+# Parallel mode: ignore NUM_TRIALS and keep simulating on all cores until the
+# 95% CI of P(Girl draws W) is within TOLERANCE of 3/20 (needs numpy)
+PARALLEL = False
+TOLERANCE = 0.0005
+NUM_WORKERS = None  # None = one per CPU core
+
+# Optional output file for the results table: "results.csv" or "results.json"
+EXPORT_PATH = None
 # ----------------------------------------------------
 
-# Run the simulation and display the results
-counts = run_simulation(NUM_TRIALS)
-display_results(counts, NUM_TRIALS)
\ No newline at end of file
+if __name__ == "__main__":
+    # Run the simulation and display the results
+    if PARALLEL and np is not None:
+        counts, num_trials = run_simulation_parallel(TOLERANCE, NUM_WORKERS, CHUNK_SIZE)
+        display_results(counts, num_trials, EXPORT_PATH)
+    elif ENGINE == "numpy" and np is not None:
+        counts = run_simulation_vectorized(NUM_TRIALS, CHUNK_SIZE)
+        display_results(counts, NUM_TRIALS, EXPORT_PATH)
+    else:
+        counts = run_simulation(NUM_TRIALS)
+        display_results(counts, NUM_TRIALS, EXPORT_PATH)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import argparse
+from collections import Counter
+from fractions import Fraction
+from functools import lru_cache
+
+
+def solve(box, stop_colours, num_players=2, replacement=True):
+    """
+    Exact outcome probabilities of a draw-until-stop game.
+
+    Players take turns drawing one ball from `box` (a list of balls or a
+    {colour: count} dict); the game ends as soon as a ball of one of the
+    `stop_colours` is drawn. Without replacement the game can also run out
+    of balls, which is reported as the outcome (None, None).
+
+    Returns {(player_index, colour): Fraction}, player 0 drawing first.
+    """
+    counts = Counter(box) if not isinstance(box, dict) else Counter(dict(box))
+    stop_colours = set(stop_colours)
+    if num_players < 1:
+        raise ValueError("Need at least one player.")
+    if replacement:
+        return _solve_with_replacement(counts, stop_colours, num_players)
+    return _solve_without_replacement(counts, stop_colours, num_players)
+
+def _solve_with_replacement(counts, stop_colours, num_players):
+    # Every turn is the same independent draw, so this is an absorbing Markov
+    # chain whose only state is whose turn it is. Player i ends the game with
+    # colour c with probability q**i * p_c / (1 - q**k), q = P(no stop).
+    total = sum(counts.values())
+    stop_probs = {c: Fraction(n, total) for c, n in counts.items() if c in stop_colours and n}
+    q = 1 - sum(stop_probs.values())
+    if q == 1:
+        raise ValueError("No stopping ball in the box: the game never ends.")
+
+    cycle = 1 - q ** num_players
+    return {(player, colour): q ** player * p / cycle
+            for player in range(num_players)
+            for colour, p in sorted(stop_probs.items())}
+
+def _solve_without_replacement(counts, stop_colours, num_players):
+    colours = sorted(counts)
+
+    @lru_cache(maxsize=None)
+    def outcome(remaining, turn):
+        total = sum(remaining)
+        if total == 0:
+            return {(None, None): Fraction(1)}
+        result = {}
+        for i, n in enumerate(remaining):
+            if not n:
+                continue
+            p = Fraction(n, total)
+            if colours[i] in stop_colours:
+                result[(turn, colours[i])] = result.get((turn, colours[i]), 0) + p
+                continue
+            after = remaining[:i] + (n - 1,) + remaining[i + 1:]
+            for key, q in outcome(after, (turn + 1) % num_players).items():
+                result[key] = result.get(key, 0) + p * q
+        return result
+
+    return dict(sorted(outcome(tuple(counts[c] for c in colours), 0).items(),
+                       key=lambda item: (item[0][0] is None, item[0])))
+
+def named(result, players):
+    """Replaces player indices by names, e.g. {('Girl', 'W'): Fraction(3, 20)}."""
+    return {(players[p] if p is not None else None, colour): prob for (p, colour), prob in result.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exact probabilities of a draw-until-stop game.")
+    parser.add_argument("--box", nargs="+", default=['W', 'W', 'Y', 'Y', 'R', 'R', 'R'],
+                        help="balls in the box, e.g. W W Y Y R R R")
+    parser.add_argument("--stop", nargs="+", default=['W', 'Y'], help="colours that end the game")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--without-replacement", action="store_true")
+    args = parser.parse_args()
+
+    result = solve(args.box, args.stop, args.players, replacement=not args.without_replacement)
+    for (player, colour), prob in result.items():
+        who = f"Player {player + 1} draws {colour}" if player is not None else "Box runs out"
+        print(f"{who:<20} {str(prob):>12}  ({float(prob):.6f})")
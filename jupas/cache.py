@@ -0,0 +1,78 @@
+import os
+import sqlite3
+import threading
+import time
+
+# Persistent title cache, next to the scripts
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "title_cache.sqlite3")
+
+# entries older than this are revalidated with the server (seconds)
+DEFAULT_TTL = 7 * 24 * 3600
+
+# least recently used entries beyond this are evicted
+DEFAULT_MAX_ENTRIES = 20000
+
+
+class OfflineMiss(LookupError):
+    """Raised in offline mode when a URL is not in the cache."""
+
+
+class TitleCache:
+    """
+    On-disk cache of extracted page titles keyed by URL.
+
+    Each entry keeps the title, the ETag / Last-Modified validators and the
+    fetch time, so stale entries can be revalidated with a conditional GET
+    instead of downloading the page again. Safe to share between threads.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("""CREATE TABLE IF NOT EXISTS titles (
+                url TEXT PRIMARY KEY, title TEXT, etag TEXT, last_modified TEXT,
+                fetched_at REAL, last_used REAL)""")
+
+    def get(self, url):
+        """Returns the entry for url as a dict (or None) and marks it as recently used."""
+        with self.lock, self.db:
+            row = self.db.execute("SELECT title, etag, last_modified, fetched_at FROM titles WHERE url = ?",
+                                  (url,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE titles SET last_used = ? WHERE url = ?", (time.time(), url))
+        return {'url': url, 'title': row[0], 'etag': row[1], 'last_modified': row[2], 'fetched_at': row[3]}
+
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def put(self, url, title, etag=None, last_modified=None):
+        now = time.time()
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?, ?, ?)",
+                            (url, title, etag, last_modified, now, now))
+            self._evict()
+
+    def touch(self, url):
+        """The server confirmed the entry is unchanged (304): restart its TTL."""
+        now = time.time()
+        with self.lock, self.db:
+            self.db.execute("UPDATE titles SET fetched_at = ?, last_used = ? WHERE url = ?", (now, now, url))
+
+    def entries(self):
+        with self.lock:
+            return [{'url': r[0], 'title': r[1]} for r in
+                    self.db.execute("SELECT url, title FROM titles ORDER BY url")]
+
+    def _evict(self):
+        # Caller holds the lock
+        count = self.db.execute("SELECT COUNT(*) FROM titles").fetchone()[0]
+        if count > self.max_entries:
+            self.db.execute("DELETE FROM titles WHERE url IN "
+                            "(SELECT url FROM titles ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,283 @@
+import codecs
+import csv
+import json
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import resolver
+from cache import OfflineMiss
+
+BASE_URL = resolver.BASE_URL
+
+# HTTP status codes worth retrying
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def build_url(code, base_url=BASE_URL):
+    """Returns (school_slug, url) for a 4-digit code; raises ValueError if it is invalid."""
+    _, school_slug, url = resolver.resolve(code, base_url)
+    return school_slug, url
+
+def expand_range(spec):
+    """'JS6001-JS6999' or '6001-6999' -> ['6001', ..., '6999']."""
+    start, _, end = spec.upper().replace("JS", "").partition("-")
+    end = end or start
+    return [f"{n:04d}" for n in range(int(start), int(end) + 1)]
+
+def all_codes():
+    """Every code x001-x999 for every university in resolver.university_map."""
+    return [code for digit in sorted(resolver.university_map) for code in expand_range(f"{digit}001-{digit}999")]
+
+# --- HTTP ---
+
+def make_session(pool_size=10):
+    """One shared session so connections are kept alive and reused across threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class RateLimiter:
+    """Spaces out requests to each host to at most `rate` per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# --- Title Extraction ---
+
+# bytes read per network chunk while looking for the title
+CHUNK_SIZE = 2048
+
+# give up waiting for a <meta charset> after this many bytes
+SNIFF_LIMIT = 4096
+
+# once the title is found, the rest of the body is still read if at most this
+# many bytes are left, so the kept-alive connection can go back to the pool;
+# for longer (or unknown-length) bodies closing and reconnecting is cheaper
+DRAIN_LIMIT = 64 * 1024
+
+class TitleParser(HTMLParser):
+    """Incremental parser that collects the text of the first <title>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_title = False
+        self.done = False
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and not self.done:
+            self.in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self.in_title:
+            self.in_title = False
+            self.done = True
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.parts.append(data)
+
+    def title(self):
+        return "".join(self.parts).strip() if self.done else None
+
+def charset_from_headers(headers):
+    match = re.search(r"charset=[\"']?([\w.:-]+)", headers.get("Content-Type", ""), re.IGNORECASE)
+    return match.group(1) if match else None
+
+def sniff_charset(head):
+    """Encoding from a BOM, <meta charset=...> or <meta http-equiv content=...charset=...>."""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    match = re.search(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", head, re.IGNORECASE)
+    return match.group(1).decode("ascii") if match else None
+
+def _decoder(encoding):
+    try:
+        return codecs.getincrementaldecoder(codecs.lookup(encoding or "utf-8").name)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+def extract_title(html_content):
+    """Title of a complete (already decoded) page, or None."""
+    parser = TitleParser()
+    parser.feed(html_content)
+    return parser.title()
+
+def drain_if_small(response, limit=DRAIN_LIMIT, chunk_size=CHUNK_SIZE):
+    """Reads the rest of the body if Content-Length says at most `limit`
+    bytes are left; a fully read response releases its connection for reuse."""
+    length = response.headers.get("Content-Length", "")
+    if not length.isdigit():
+        return
+    # raw.tell() counts the bytes off the wire, before any gzip decoding
+    if int(length) - response.raw.tell() <= limit:
+        for _ in response.raw.stream(chunk_size, decode_content=False):
+            pass
+
+def read_title(response, chunk_size=CHUNK_SIZE):
+    """
+    Streams a response into TitleParser and stops as soon as the title is
+    complete. A short remainder is drained so the connection stays in the
+    keep-alive pool (see DRAIN_LIMIT); a long one is cut off by closing.
+
+    The charset comes from the Content-Type header, otherwise from a BOM or
+    <meta> tag in the first SNIFF_LIMIT bytes, otherwise UTF-8.
+    """
+    encoding = charset_from_headers(response.headers)
+    parser = TitleParser()
+    decoder = None
+    head = b""
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if decoder is None:
+                # Hold the first bytes back until the encoding is known
+                head += chunk
+                if encoding is None:
+                    encoding = sniff_charset(head)
+                    if encoding is None and len(head) < SNIFF_LIMIT and b"</title" not in head.lower():
+                        continue
+                decoder = _decoder(encoding)
+                chunk, head = head, b""
+            parser.feed(decoder.decode(chunk))
+            if parser.done:
+                drain_if_small(response, chunk_size=chunk_size)
+                break
+        else:
+            if decoder is None:
+                decoder = _decoder(encoding or sniff_charset(head))
+            parser.feed(decoder.decode(head, final=True))
+            parser.close()
+    finally:
+        response.close()
+    return parser.title()
+
+def fetch_title(session, url, rate_limiter=None, retries=3, backoff=0.5, timeout=10, cache=None, offline=False):
+    """
+    Fetches url and returns its <title> (None if the page has no title).
+
+    With a cache (cache.TitleCache), fresh entries are answered locally and
+    stale ones are revalidated with If-None-Match / If-Modified-Since; a 304
+    keeps the cached title. In offline mode only the cache is consulted and
+    a miss raises OfflineMiss.
+
+    Connection errors, timeouts and 429/5xx responses are retried with
+    exponential backoff (honouring Retry-After); other HTTP errors and the
+    last failure are raised as requests exceptions.
+    """
+    entry = cache.get(url) if cache is not None else None
+    if offline:
+        if entry is None:
+            raise OfflineMiss(url)
+        return entry['title']
+    if entry is not None and cache.is_fresh(entry):
+        return entry['title']
+
+    headers = {}
+    if entry is not None:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    for attempt in range(retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        try:
+            response = session.get(url, timeout=timeout, headers=headers, stream=True)
+            if response.status_code in RETRY_STATUS and attempt < retries:
+                response.close()
+                delay = response.headers.get("Retry-After")
+                time.sleep(float(delay) if delay and delay.isdigit() else backoff * 2 ** attempt)
+                continue
+            if response.status_code == 304:
+                response.close()
+                if entry is None:
+                    # Nothing was asked conditionally, so there is no title to keep
+                    raise requests.exceptions.HTTPError(f"304 Not Modified without a cached title for url: {url}",
+                                                        response=response)
+                cache.touch(url)
+                return entry['title']
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+            title = read_title(response)
+            if cache is not None:
+                cache.put(url, title, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return title
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+def fetch_many(codes, workers=8, rate=5.0, base_url=BASE_URL, retries=3, timeout=10, session=None,
+               cache=None, offline=False):
+    """
+    Fetches the titles of many codes concurrently with a bounded thread pool.
+
+    Returns one dict per code (in input order) with code, university, url,
+    title and error.
+    """
+    session = session or make_session(workers)
+    rate_limiter = RateLimiter(rate)
+
+    def fetch_one(code):
+        result = {'code': code, 'university': None, 'url': None, 'title': None, 'error': None}
+        try:
+            result['university'], result['url'] = build_url(code, base_url)
+            result['title'] = fetch_title(session, result['url'], rate_limiter, retries, timeout=timeout,
+                                          cache=cache, offline=offline)
+            if result['title'] is None:
+                result['error'] = "no <title> in page"
+        except ValueError as e:
+            result['error'] = str(e)
+        except OfflineMiss:
+            result['error'] = "not in cache (offline)"
+        except requests.exceptions.RequestException as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fetch_one, codes))
+
+# --- Output ---
+
+FIELDS = ['code', 'university', 'url', 'title', 'error']
+
+def write_results(results, path=None, fmt="csv"):
+    """Writes results as CSV or JSON Lines to path (stdout if None)."""
+    f = open(path, "w", newline="", encoding="utf-8") if path else sys.stdout
+    try:
+        if fmt == "jsonl":
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+    finally:
+        if path:
+            f.close()
@@ -1,29 +1,23 @@
 import requests # For making HTTP requests to fetch page content
 import pyperclip # For copying text to the clipboard
-import re # For regular expression matching
 import sys 
+import argparse
+
+import fetcher # Shared URL building and concurrent batch fetching
+import resolver # Shared code -> university / URL resolver
+from cache import TitleCache, OfflineMiss, DEFAULT_TTL, DEFAULT_MAX_ENTRIES # Local title cache
 
 # Note: You may need to install the following libraries if you haven't already:
 # pip install requests pyperclip
 
-def main_loop():
+def main_loop(cache=None, offline=False):
     """
     Runs a continuous loop to prompt the user for JUPAS codes, 
     fetches the page title, and copies the title to the clipboard.
+    Titles fetched before are answered from the cache, if one is given.
     """
-    # Mapping the first digit of the program code to the university slug
-    university_map = {
-        '4': 'cuhk',    # Chinese University of Hong Kong
-        '5': 'hkust',   # Hong Kong University of Science and Technology
-        '6': 'hku',     # The University of Hong Kong
-        '1': 'cityuhk', # City University of Hong Kong
-        '3': 'polyu',    # The Hong Kong Polytechnic University
-        '2': 'hkbu',
-        '8': 'eduhk',   # The Education University of Hong Kong
-        '9': 'hkmu',   # Hong Kong Metropolitan University
-        '7': 'lingnanu'
-    }
-    
+    session = fetcher.make_session(1)
+
     print("JUPAS Title Fetcher is running.")
     print("Enter 'quit' or 'exit' to stop the program.\n")
 
@@ -36,40 +30,28 @@ def main_loop():
             print("\nExiting JUPAS Title Fetcher. Goodbye!")
             break
 
-        # Input validation
-        if not s.isdigit() or len(s) != 4:
-            print(f"\n[ERROR] Input must be exactly a 4-digit number. You entered: '{s}'")
-            print("-" * 20)
-            continue # Go back to the start of the loop
-
-        first_digit = s[0]
-
-        if first_digit not in university_map:
-            print(f"\n[ERROR] The first digit '{first_digit}' does not correspond to a mapped university code (1, 3, 4, 5, 6).")
+        # Input validation and URL construction
+        try:
+            s, school_slug, url = resolver.resolve(s)
+        except ValueError as e:
+            print(f"\n[ERROR] {e}")
             print("-" * 20)
             continue # Go back to the start of the loop
 
-        # 1. Determine the university part
-        school_slug = university_map[first_digit]
-
-        # 2. Determine the code part
-        program_code = f"JS{s}"
-
-        # 3. Construct the final URL
-        url = f"https://www.jupas.edu.hk/en/programme/{school_slug}/{program_code}/"
-
         print("\n--- Processing ---")
         print(f"Code: {s} | University: {school_slug.upper()}")
         print(f"URL: {url}")
         
-        # 4. Fetch the webpage content
+        # 4. Fetch the page and extract the <title> (or answer from the cache)
         try:
             print("Fetching webpage content...")
             # Use a short timeout to prevent hanging indefinitely
-            response = requests.get(url, timeout=10)
-            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-            html_content = response.text
+            page_title = fetcher.fetch_title(session, url, timeout=10, cache=cache, offline=offline)
 
+        except OfflineMiss:
+            print("\n[OFFLINE] This programme is not in the local cache.")
+            print("-" * 20)
+            continue
         except requests.exceptions.HTTPError as err:
             print(f"\n[FETCH ERROR] Failed to fetch the URL due to HTTP error: {err}")
             print("-" * 20)
@@ -87,15 +69,8 @@ def main_loop():
             print("-" * 20)
             continue
 
-        # 5. Extract the <title> content using a regular expression
-        # This regex captures content between <title> and </title> tags
-        title_match = re.search(r"<title>(.*?)</title>", html_content, re.IGNORECASE | re.DOTALL)
-
-        if title_match:
-            # Extract the captured group (the content inside the tags)
-            page_title = title_match.group(1).strip()
-
-            # 6. Copy the output line to the clipboard
+        if page_title:
+            # 5. Copy the output line to the clipboard
             try:
                 pyperclip.copy(page_title)
                 print(f"\n[SUCCESS] Info copied to clipboard:")
@@ -111,6 +86,60 @@ def main_loop():
             print("This usually means the program code is invalid or the page doesn't exist.")
             print("-" * 20)
 
+def add_cache_arguments(parser):
+    parser.add_argument("--no-cache", action="store_true", help="always download the page")
+    parser.add_argument("--offline", action="store_true", help="answer only from the local cache")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL / 3600, help="hours before a cached title is revalidated")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES, help="max cached titles (least recently used go first)")
+
+def open_cache(args):
+    if args.no_cache:
+        return None
+    return TitleCache(ttl=args.ttl * 3600, max_entries=args.cache_size)
+
+def batch_main(argv):
+    """
+    Batch mode: fetches the titles of many codes concurrently and writes
+    code -> title results as CSV or JSON Lines. Without any codes it falls
+    back to the interactive loop.
+    """
+    parser = argparse.ArgumentParser(description="Fetch JUPAS programme titles in bulk.")
+    parser.add_argument("codes", nargs="*", help="4-digit codes; '-' reads codes from stdin")
+    parser.add_argument("--file", help="file with one code per line")
+    parser.add_argument("--range", action="append", default=[], help="code range, e.g. JS6001-JS6999")
+    parser.add_argument("--all", action="store_true", help="every x001-x999 for every university")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests")
+    parser.add_argument("--rate", type=float, default=5.0, help="max requests per second per host")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--base-url", default=fetcher.BASE_URL, help="e.g. a local test server")
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    codes = [c for c in args.codes if c != "-"]
+    if "-" in args.codes:
+        codes += [line.strip() for line in sys.stdin if line.strip()]
+    if args.file:
+        with open(args.file) as f:
+            codes += [line.strip() for line in f if line.strip()]
+    for spec in args.range:
+        codes += fetcher.expand_range(spec)
+    if args.all:
+        codes += fetcher.all_codes()
+
+    cache = open_cache(args)
+    if not codes:
+        main_loop(cache, args.offline)
+        return
+
+    results = fetcher.fetch_many(codes, workers=args.workers, rate=args.rate,
+                                 base_url=args.base_url, retries=args.retries,
+                                 cache=cache, offline=args.offline)
+    fetcher.write_results(results, args.output, args.format)
+
+    found = sum(1 for r in results if r['title'])
+    print(f"[DONE] {found} of {len(results)} codes have a title.", file=sys.stderr)
+
 if __name__ == "__main__":
-    main_loop()
-    main_loop()
+    batch_main(sys.argv[1:])
\ No newline at end of file
@@ -1,44 +1,43 @@
 import webbrowser
 import sys
+import argparse
+import csv
+import subprocess
+
+import resolver # Shared code -> university / URL resolver and programme index
 
 def open_jupas_link():
     """
-    Prompts the user for a 4-digit JUPAS code, constructs the corresponding 
-    university program link, and opens it in the default web browser.
+    Prompts the user for a 4-digit JUPAS code (or part of a programme name),
+    constructs the corresponding university program link, and opens it in
+    the default web browser.
     """
-    # Mapping the first digit of the program code to the university slug
-    university_map = {
-        '4': 'cuhk',    # Chinese University of Hong Kong
-        '5': 'hkust',   # Hong Kong University of Science and Technology
-        '6': 'hku',     # The University of Hong Kong
-        '1': 'cityuhk', # City University of Hong Kong
-        '3': 'polyu'    # The Hong Kong Polytechnic University
-    }
-
     # Get input from the user
-    s = input("Enter a 4-digit JUPAS program number (e.g., 6303 or 5240): ").strip()
+    s = input("Enter a 4-digit JUPAS program number or a programme name (e.g., 6303 or Law): ").strip()
 
-    # Input validation
-    if not s.isdigit() or len(s) != 4:
-        print(f"\nError: Input must be exactly a 4-digit number. You entered: '{s}'")
-        # Exit the function if validation fails
-        return
+    # A name: look it up in the local programme index (no network needed)
+    if s and not s.upper().removeprefix("JS").isdigit():
+        matches = resolver.search_titles(s, limit=9)
+        if not matches:
+            print(f"\nError: No programme in the local index matches '{s}'. (Build it with: python resolver.py build)")
+            return
+        index = resolver.load_index()
+        for i, code in enumerate(matches, 1):
+            print(f"{i}. JS{code}  {index[code]}")
+        choice = input("Pick a programme number (Enter for 1): ").strip() or "1"
+        if not choice.isdigit() or not 1 <= int(choice) <= len(matches):
+            print(f"\nError: '{choice}' is not one of the listed programmes.")
+            return
+        s = matches[int(choice) - 1]
 
-    first_digit = s[0]
-
-    if first_digit not in university_map:
-        print(f"\nError: The first digit '{first_digit}' does not correspond to a mapped university code (1, 3, 4, 5, 6).")
+    # Input validation and URL construction
+    try:
+        s, school_slug, url = resolver.resolve(s)
+    except ValueError as e:
+        print(f"\nError: {e}")
+        # Exit the function if validation fails
         return
 
-    # 1. Determine the university part
-    school_slug = university_map[first_digit]
-
-    # 2. Determine the code part
-    program_code = f"JS{s}"
-
-    # 3. Construct the final URL
-    url = f"https://www.jupas.edu.hk/en/programme/{school_slug}/{program_code}/"
-
     print("\n---")
     print(f"Input program code: {s}")
     print(f"Detected University: {school_slug.upper()}")
@@ -53,5 +52,94 @@ def open_jupas_link():
         print(f"\nFailed to open web browser. Please open the URL manually.")
         print(f"Details: {e}")
 
+# Browsers whose command line takes several URLs in one launch
+MULTI_URL_BROWSERS = (webbrowser.Mozilla, webbrowser.Chrome)
+
+def open_in_browser(urls):
+    """
+    Opens all urls in one launch for browsers that take several URLs on
+    their command line (Firefox, Chrome/Chromium), otherwise one tab per
+    URL through the webbrowser module.
+    """
+    controller = webbrowser.get()
+    if isinstance(controller, MULTI_URL_BROWSERS) and len(urls) > 1:
+        # Same arguments the controller itself uses for open_new_tab, once per URL
+        action = controller.remote_action_newtab or ""
+        command = [controller.name]
+        for url in urls:
+            command += [arg.replace("%action", action).replace("%s", url) for arg in controller.remote_args]
+        subprocess.Popen([arg for arg in command if arg])
+        return
+    for url in urls:
+        webbrowser.open_new_tab(url)
+
+def write_urls(rows, path):
+    """Writes (code, university, url) rows as .csv, or one URL per line otherwise."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            writer = csv.writer(f)
+            writer.writerow(["code", "university", "url"])
+            writer.writerows(rows)
+        else:
+            f.writelines(url + "\n" for _, _, url in rows)
+
+def main(argv=None):
+    """
+    Command line entry point. Codes come from arguments, --file or a pipe;
+    all of them are validated before anything is printed or opened.
+    Without any codes on an interactive terminal it asks like before.
+    """
+    parser = argparse.ArgumentParser(description="Build (and open) JUPAS programme links.")
+    parser.add_argument("codes", nargs="*", help="4-digit codes such as 6303 or JS5240; '-' reads stdin")
+    parser.add_argument("--file", help="file with one code per line")
+    parser.add_argument("--output", help="write the URLs to a .csv or .txt file")
+    parser.add_argument("--open", action="store_true", help="open every link in the browser")
+    parser.add_argument("--dry-run", action="store_true", help="never touch the browser, just show what would open")
+    args = parser.parse_args(argv)
+
+    codes = [c for c in args.codes if c != "-"]
+    if "-" in args.codes or (not codes and not args.file and not sys.stdin.isatty()):
+        codes += [line.strip() for line in sys.stdin if line.strip()]
+    if args.file:
+        with open(args.file) as f:
+            codes += [line.strip() for line in f if line.strip()]
+
+    if not codes:
+        open_jupas_link()
+        return 0
+
+    # Validate everything first so a typo doesn't leave half the tabs open
+    rows, errors = [], []
+    for code in codes:
+        try:
+            rows.append(resolver.resolve(code))
+        except ValueError as e:
+            errors.append(f"{code}: {e}")
+    if errors:
+        print("Error: some codes are invalid, nothing was opened:", file=sys.stderr)
+        for error in errors:
+            print(f"  {error}", file=sys.stderr)
+        return 1
+
+    for code, school_slug, url in rows:
+        print(f"JS{code}\t{school_slug.upper()}\t{url}")
+    if args.output:
+        write_urls(rows, args.output)
+        print(f"Wrote {len(rows)} URLs to {args.output}", file=sys.stderr)
+
+    urls = [url for _, _, url in rows]
+    if args.dry_run:
+        if args.open:
+            print(f"(dry run) Would open {len(urls)} links in the browser.", file=sys.stderr)
+    elif args.open:
+        try:
+            open_in_browser(urls)
+            print(f"\nOpening {len(urls)} links in your default web browser...", file=sys.stderr)
+        except Exception as e:
+            print("\nFailed to open web browser. Please open the URLs manually.", file=sys.stderr)
+            print(f"Details: {e}", file=sys.stderr)
+            return 1
+    return 0
+
 if __name__ == "__main__":
-    open_jupas_link()
+    sys.exit(main())
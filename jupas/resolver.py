@@ -0,0 +1,138 @@
+import argparse
+import bisect
+import difflib
+import os
+
+BASE_URL = "https://www.jupas.edu.hk/en/programme"
+
+# Mapping the first digit of the program code to the university slug
+university_map = {
+    '1': 'cityuhk', # City University of Hong Kong
+    '2': 'hkbu',    # Hong Kong Baptist University
+    '3': 'polyu',   # The Hong Kong Polytechnic University
+    '4': 'cuhk',    # Chinese University of Hong Kong
+    '5': 'hkust',   # Hong Kong University of Science and Technology
+    '6': 'hku',     # The University of Hong Kong
+    '7': 'lingnanu',# Lingnan University
+    '8': 'eduhk',   # The Education University of Hong Kong
+    '9': 'hkmu',    # Hong Kong Metropolitan University
+}
+
+# Local programme index: one "code<TAB>title" line per programme, sorted by code
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programmes.tsv")
+
+
+def normalize_code(code):
+    """'JS6001', 'js6001' or '6001' -> '6001'; raises ValueError if it is not a valid code."""
+    code = code.strip().upper()
+    if code.startswith("JS"):
+        code = code[2:]
+    if not code.isdigit() or len(code) != 4:
+        raise ValueError(f"Input must be exactly a 4-digit number. You entered: '{code}'")
+    if code[0] not in university_map:
+        raise ValueError(f"The first digit '{code[0]}' does not correspond to a mapped university code "
+                         f"({', '.join(sorted(university_map))}).")
+    return code
+
+def resolve(code, base_url=BASE_URL):
+    """Returns (code, school_slug, url) for a programme code."""
+    code = normalize_code(code)
+    school_slug = university_map[code[0]]
+    return code, school_slug, f"{base_url.rstrip('/')}/{school_slug}/JS{code}/"
+
+# --- Programme Index ---
+
+_index = None
+_sorted_codes = None
+
+def read_index(path=INDEX_FILE):
+    """{code: title} from an index file (empty if it has not been built yet)."""
+    index = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                code, _, title = line.rstrip("\n").partition("\t")
+                if code:
+                    index[code] = title
+    return index
+
+def load_index():
+    """The programme index, read once per process."""
+    global _index, _sorted_codes
+    if _index is None:
+        _index = read_index()
+        _sorted_codes = sorted(_index)
+    return _index
+
+def lookup(code):
+    """(code, slug, url, title) with the title from the index (None if unknown)."""
+    code, school_slug, url = resolve(code)
+    return code, school_slug, url, load_index().get(code)
+
+def prefix_search(prefix):
+    """Indexed codes starting with prefix, e.g. '6' or 'JS63'."""
+    load_index()
+    prefix = prefix.strip().upper().removeprefix("JS")
+    start = bisect.bisect_left(_sorted_codes, prefix)
+    end = bisect.bisect_left(_sorted_codes, prefix + "\uffff")
+    return _sorted_codes[start:end]
+
+def search_titles(query, limit=10):
+    """
+    Codes whose title matches query: titles containing every word of the
+    query first, then close fuzzy matches (difflib).
+    """
+    index = load_index()
+    words = query.lower().split()
+    exact = [code for code, title in index.items() if all(w in title.lower() for w in words)]
+    if len(exact) >= limit:
+        return sorted(exact)[:limit]
+
+    by_title = {}
+    for code, title in index.items():
+        by_title.setdefault(title.lower(), []).append(code)
+    close = difflib.get_close_matches(query.lower(), list(by_title), n=limit, cutoff=0.4)
+    fuzzy = [code for title in close for code in by_title[title] if code not in exact]
+    return (sorted(exact) + fuzzy)[:limit]
+
+def write_index(titles, path=INDEX_FILE):
+    """Writes {code: title} as the index file (codes sorted, empty titles dropped)."""
+    with open(path, "w", encoding="utf-8") as f:
+        for code in sorted(titles):
+            if titles[code]:
+                f.write(f"{code}\t{' '.join(titles[code].split())}\n")
+    global _index
+    _index = None  # reload on next use
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the local JUPAS programme index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="(re)build programmes.tsv")
+    build.add_argument("--fetch", action="store_true", help="fetch every code of every university (slow)")
+    find = sub.add_parser("search", help="find programmes by code prefix or title")
+    find.add_argument("query")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from cache import TitleCache
+        import fetcher
+
+        titles = dict(load_index())
+        cache = TitleCache()
+        # Everything fetched before is already in the title cache
+        for entry in cache.entries():
+            code = entry['url'].rstrip("/").rsplit("/JS", 1)[-1]
+            if entry['title'] and code.isdigit():
+                titles[code] = entry['title']
+        if args.fetch:
+            for result in fetcher.fetch_many(fetcher.all_codes(), cache=cache):
+                if result['title']:
+                    titles[result['code']] = result['title']
+        write_index(titles)
+        print(f"Indexed {sum(1 for t in titles.values() if t)} programmes in {INDEX_FILE}")
+    else:
+        q = args.query.strip()
+        codes = prefix_search(q) if q.upper().removeprefix("JS").isdigit() else search_titles(q)
+        for code in codes:
+            print(f"JS{code}  {load_index().get(code, '')}")
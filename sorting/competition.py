@@ -1,8 +1,17 @@
-import random
-import time
-import copy
 import sys
 import math
+import statistics
+import struct
+import os
+import multiprocessing
+
+import harness
+import instrument
+import numpy_backends
+import distributions
+import parallel_sort
+import sweep
+import results_store
 
 # ==============================================================================
 # === USER CONFIGURATION ===
@@ -16,16 +25,85 @@ M = 1000
 # number of competitions
 NUM_RUNS = 100
 # === SORTING METHOD SELECTION ===
-# 1: Bubble Sort        5: Quick Sort
-# 2: Insertion Sort     6: Power Sort
-# 3: Selection Sort     7: Counting Sort
-# 4: Merge Sort
+# 1: Bubble Sort        5: Quick Sort         9: MSD Radix Sort
+# 2: Insertion Sort     6: Power Sort         10: Adaptive Counting Sort
+# 3: Selection Sort     7: Counting Sort      11: Auto Sort (picks one of the
+# 4: Merge Sort         8: LSD Radix Sort         others from stored results)
+# NumPy backends (need numpy; sort int arrays instead of lists of Python ints):
+# np1: NumPy Quick Sort     np4: NumPy Stable Sort
+# np2: NumPy Merge Sort     np5: NumPy Counting Sort
+# np3: NumPy Heap Sort      np6: NumPy Radix Sort
 choices = [4, 5, 6]
+
+# === NUMPY BACKEND ===
+# element type of the numpy input arrays ("int32" or "int64")
+NUMPY_DTYPE = "int64"
+
+# list-based (pure Python) algorithms are skipped above this N,
+# numpy backends keep going (e.g. add 10**6, 10**7 to Ns)
+PYTHON_MAX_N = 100000
+
+# === PARALLEL EXECUTION ===
+# number of worker processes (1 = run everything in this process)
+NUM_WORKERS = 1
+
+# seed for the input lists (None = different lists every time)
+SEED = 12345
+
+# === INPUT DISTRIBUTIONS ===
+# every competition is repeated for each of these data shapes:
+# random, sorted, reverse, nearly_sorted, sawtooth, organ_pipe,
+# few_unique, all_equal, zipf, wide64
+DISTRIBUTIONS = ["random", "sorted", "reverse", "nearly_sorted", "sawtooth",
+                 "organ_pipe", "few_unique", "all_equal", "zipf", "wide64"]
+
+# === TIMING ===
+# timed samples per algorithm per competition
+REPEATS = 5
+
+# untimed warm-up runs per algorithm per competition
+WARMUP = 1
+
+# a win only counts if it is significant at this level
+ALPHA = 0.05
+
+# also report each algorithm's peak memory (one extra traced run per N)
+REPORT_MEMORY = True
+
+# append every run to the results store (see results_store.py)
+SAVE_RESULTS = True
+
+# === INSTRUMENTATION ===
+# count comparisons, moves, call depth and allocations in one extra untimed
+# run per algorithm and N (slow, but the timings are unaffected; see instrument.py)
+INSTRUMENT = False
+
+# === ADAPTIVE SWEEP ===
+# seconds per algorithm and distribution for a sweep that grows N until the
+# budget is spent and fits its time to a * n^b * log^c n; the predicted
+# crossovers decide which algorithms sit out which N of that distribution
+# (0 = no sweep, nothing is skipped)
+SWEEP_BUDGET = 2.0
+
+# sit out an N when predicted this many times slower than another algorithm
+SKIP_FACTOR = 1000
+
+# ...or when a single sort is predicted to take longer than this (s)
+SKIP_TIME = 0.5
+
+# === PARALLEL SORT ===
+# core counts for the parallel merge sort speedup curve (empty = skip); it runs
+# on the random input at the largest list N, next to the algorithms above
+PARALLEL_CORES = [1, 2, 4]
+
+# in-memory algorithm that sorts each core's partition
+PARALLEL_CHUNK_SORT = "merge_sort"
 # ==============================================================================
 # ==============================================================================
 
 
-sys.setrecursionlimit(3000)
+# label used in win_counts for competitions without a significant winner
+TIE = "Tie"
 
 # --- Sorting Algorithm Definitions ---
 
@@ -58,41 +136,173 @@ def selection_sort(a):
     return a
 
 def merge_sort(a):
-    if len(a) > 1:
-        mid = len(a) // 2
-        L, R = a[:mid], a[mid:]
-        merge_sort(L)
-        merge_sort(R)
-        i = j = k = 0
-        while i < len(L) and j < len(R):
-            if L[i] <= R[j]: a[k] = L[i]; i += 1
-            else: a[k] = R[j]; j += 1
-            k += 1
-        while i < len(L): a[k] = L[i]; i += 1; k += 1
-        while j < len(R): a[k] = R[j]; j += 1; k += 1
+    """Bottom-up natural merge sort.
+
+    Starts from the runs already present in the input (strictly descending
+    runs are reversed in place, so reverse-sorted input is one run) and
+    merges neighbouring runs pass by pass, ping-ponging between a and one
+    auxiliary buffer that is allocated once. Two runs that are already in
+    order are copied instead of merged, so sorted input costs a single pass.
+    Elements are copied one index at a time: no slice makes a temporary list.
+    """
+    n = len(a)
+    if n < 2: return a
+
+    # Start of every maximal run, plus the end
+    bounds = [0]
+    start = 0
+    while start < n:
+        end = start + 1
+        if end < n and a[end] < a[start]:
+            # Strictly descending only, so reversing keeps equal keys in order
+            while end < n and a[end] < a[end - 1]:
+                end += 1
+            lo, hi = start, end - 1
+            while lo < hi:
+                a[lo], a[hi] = a[hi], a[lo]
+                lo += 1; hi -= 1
+        else:
+            while end < n and not a[end] < a[end - 1]:
+                end += 1
+        bounds.append(end)
+        start = end
+    if len(bounds) == 2: return a
+
+    # The buffer has the input's type so instrument.py sees its writes too
+    src, dst = a, type(a)([None] * n)
+    while len(bounds) > 2:
+        merged_bounds = [0]
+        for r in range(0, len(bounds) - 1, 2):
+            lo = bounds[r]
+            if r + 2 >= len(bounds):
+                # Odd run out: carry it over to the other buffer
+                for k in range(lo, n):
+                    dst[k] = src[k]
+                merged_bounds.append(n)
+                break
+            mid, hi = bounds[r + 1], bounds[r + 2]
+            if src[mid - 1] <= src[mid]:
+                for k in range(lo, hi):
+                    dst[k] = src[k]
+            else:
+                i, j, k = lo, mid, lo
+                while i < mid and j < hi:
+                    if src[j] < src[i]: dst[k] = src[j]; j += 1
+                    else: dst[k] = src[i]; i += 1
+                    k += 1
+                while i < mid:
+                    dst[k] = src[i]; i += 1; k += 1
+                while j < hi:
+                    dst[k] = src[j]; j += 1; k += 1
+            merged_bounds.append(hi)
+        src, dst = dst, src
+        bounds = merged_bounds
+
+    if src is not a:
+        for k in range(n):
+            a[k] = src[k]
     return a
 
+# Partitions at or below this size are finished by insertion sort
+INSERTION_CUTOFF = 16
+
 def quick_sort(a):
-    if not a: return a
-    quick_sort_helper(a, 0, len(a) - 1)
+    """Iterative introsort.
+
+    Ninther/median-of-three pivots, three-way (Dutch flag) partitioning so
+    runs of equal keys are finished in one pass, insertion sort for small
+    partitions and heapsort once the depth limit is hit. The larger side is
+    pushed on an explicit stack, so the stack stays O(log n) and no recursion
+    limit is involved.
+    """
+    n = len(a)
+    if n < 2: return a
+    stack = [(0, n - 1, 2 * n.bit_length())]
+    while stack:
+        low, high, depth = stack.pop()
+        while high - low + 1 > INSERTION_CUTOFF:
+            if depth == 0:
+                heap_sort_range(a, low, high)
+                break
+            depth -= 1
+            lt, gt = partition3(a, low, high, choose_pivot(a, low, high))
+            # Keep working on the smaller side, defer the larger one
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth))
+                low = gt + 1
+        else:
+            insertion_sort_range(a, low, high)
     return a
 
-def quick_sort_helper(a, low, high):
-    if low < high:
-        pi = partition(a, low, high)
-        quick_sort_helper(a, low, pi - 1)
-        quick_sort_helper(a, pi + 1, high)
-
-def partition(a, low, high):
-    pivot = a[high]
-    i = low - 1
-    for j in range(low, high):
-        if a[j] <= pivot:
+def median_of_three(a, i, j, k):
+    x, y, z = a[i], a[j], a[k]
+    if x < y:
+        if y < z: return y
+        return z if x < z else x
+    if x < z: return x
+    return z if y < z else y
+
+def choose_pivot(a, low, high):
+    """Median of three for small ranges, Tukey's ninther for large ones."""
+    mid = (low + high) // 2
+    if high - low < 40:
+        return median_of_three(a, low, mid, high)
+    s = (high - low) // 8
+    return sorted((median_of_three(a, low, low + s, low + 2 * s),
+                   median_of_three(a, mid - s, mid, mid + s),
+                   median_of_three(a, high - 2 * s, high - s, high)))[1]
+
+def partition3(a, low, high, pivot):
+    """Dutch flag partition of a[low..high]; returns (lt, gt) so that
+    a[low..lt-1] < pivot, a[lt..gt] == pivot and a[gt+1..high] > pivot."""
+    lt, i, gt = low, low, high
+    while i <= gt:
+        x = a[i]
+        if x < pivot:
+            a[i] = a[lt]; a[lt] = x
+            lt += 1; i += 1
+        elif x > pivot:
+            a[i] = a[gt]; a[gt] = x
+            gt -= 1
+        else:
             i += 1
-            a[i], a[j] = a[j], a[i]
-    a[i + 1], a[high] = a[high], a[i + 1]
-    return i + 1
+    return lt, gt
 
+def insertion_sort_range(a, low, high):
+    for i in range(low + 1, high + 1):
+        key = a[i]
+        j = i - 1
+        while j >= low and key < a[j]:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = key
+
+def heap_sort_range(a, low, high):
+    """In-place heapsort of a[low..high] (introsort's worst-case fallback)."""
+    n = high - low + 1
+    for start in range(n // 2 - 1, -1, -1):
+        sift_down(a, low, start, n)
+    for end in range(n - 1, 0, -1):
+        a[low], a[low + end] = a[low + end], a[low]
+        sift_down(a, low, 0, end)
+
+def sift_down(a, base, root, size):
+    item = a[base + root]
+    child = 2 * root + 1
+    while child < size:
+        if child + 1 < size and a[base + child] < a[base + child + 1]:
+            child += 1
+        if not item < a[base + child]:
+            break
+        a[base + root] = a[base + child]
+        root = child
+        child = 2 * root + 1
+    a[base + root] = item
+
+@instrument.unobserved("moves")
 def power_sort(a):
     """Mathematical curiosity sort. Fast because it uses Timsort internally."""
     if any(x < 0 for x in a): return a
@@ -116,61 +326,520 @@ def counting_sort(a):
             i += 1
     return a
 
-# --- Test and Timing Functions ---
+@instrument.unobserved("moves")
+def counting_sort_adaptive(a):
+    """Counting sort over [min(a), max(a)], so memory follows the key range
+    rather than the largest key and negative numbers are fine. Switches to
+    LSD radix sort when the range is much larger than N (or for floats)."""
+    if len(a) < 2: return a
+    if not all(isinstance(x, int) for x in a):
+        return lsd_radix_sort(a)
+    lo, hi = min(a), max(a)
+    if hi - lo + 1 > COUNTING_RANGE_FACTOR * len(a):
+        return lsd_radix_sort(a)
+
+    count = [0] * (hi - lo + 1)
+    for x in a:
+        count[x - lo] += 1
 
-def run_single_test(sort_f, l):
-    """Times a single run of a sorting function."""
-    l_to_sort = copy.deepcopy(l)
-    start = time.perf_counter()
-    sort_f(l_to_sort)
-    end = time.perf_counter()
-    return end - start
+    i = 0
+    for offset, c in enumerate(count):
+        if c:
+            a[i:i + c] = [offset + lo] * c
+            i += c
+    return a
 
-def run_competition(sort_funcs, labels, Ns, init_l, num_runs):
-    """Runs a head-to-head competition for the selected algorithms."""
-    win_counts = {}
-    slow_algorithms = {"Bubble Sort", "Insertion Sort", "Selection Sort"}
+# --- Radix Sorts ---
+# Keys are turned into non-negative ints with the same order (offset by the
+# minimum for ints, IEEE-754 bit trick for floats) and sorted RADIX_BITS at
+# a time. Lists mixing ints and floats are sorted as floats.
+
+RADIX_BITS = 8
+RADIX_MASK = (1 << RADIX_BITS) - 1
+
+# MSD buckets at or below this size are finished by insertion sort
+MSD_CUTOFF = 32
+
+# counting sort hands over to radix sort when max - min + 1 > factor * N
+COUNTING_RANGE_FACTOR = 4
+
+_SIGN_BIT = 1 << 63
+_ALL_BITS = (1 << 64) - 1
+
+def _float_key(x):
+    bits = struct.unpack('>Q', struct.pack('>d', x))[0]
+    return bits ^ _ALL_BITS if bits & _SIGN_BIT else bits | _SIGN_BIT
+
+def _key_float(k):
+    bits = k ^ _SIGN_BIT if k & _SIGN_BIT else k ^ _ALL_BITS
+    return struct.unpack('>d', struct.pack('>Q', bits))[0]
+
+def radix_keys(a):
+    """Returns (keys, decode): order-preserving non-negative int keys for a and
+    the function that turns a sorted key list back into values."""
+    if all(isinstance(x, int) for x in a):
+        lo = min(a)
+        return [x - lo for x in a], lambda keys: [k + lo for k in keys]
+    if not all(isinstance(x, (int, float)) for x in a):
+        # float() would also accept numeric strings and quietly sort them as numbers
+        raise TypeError("radix sort needs int or float values")
+    raw = [_float_key(float(x)) for x in a]
+    lo = min(raw)
+    return [k - lo for k in raw], lambda keys: [_key_float(k + lo) for k in keys]
+
+@instrument.unobserved("moves")
+def lsd_radix_sort(a):
+    """LSD radix sort on byte-sized digits; one stable bucket pass per digit."""
+    if len(a) < 2: return a
+    keys, decode = radix_keys(a)
+    passes = (max(keys).bit_length() + RADIX_BITS - 1) // RADIX_BITS
+    for p in range(passes):
+        shift = p * RADIX_BITS
+        buckets = [[] for _ in range(RADIX_MASK + 1)]
+        for k in keys:
+            buckets[(k >> shift) & RADIX_MASK].append(k)
+        keys = [k for bucket in buckets for k in bucket]
+    a[:] = decode(keys)
+    return a
 
-    # Generate header for the competition title
-    title_header = " vs ".join([label.upper() for label in labels])
-    print(f"\n--- Competition: {title_header} ({num_runs} Runs) ---")
+@instrument.unobserved("comparisons", "moves")
+def msd_radix_sort(a):
+    """MSD radix sort on byte-sized digits, most significant first.
+
+    Buckets are refined with an explicit stack (smallest digit on top, so
+    they come off in order); buckets of MSD_CUTOFF keys or fewer go to
+    insertion sort instead of another bucket pass.
+    """
+    if len(a) < 2: return a
+    keys, decode = radix_keys(a)
+    passes = (max(keys).bit_length() + RADIX_BITS - 1) // RADIX_BITS
+    out = []
+    stack = [(keys, (passes - 1) * RADIX_BITS)]
+    while stack:
+        bucket, shift = stack.pop()
+        if shift < 0 or len(bucket) <= MSD_CUTOFF:
+            out.extend(insertion_sort(bucket) if shift >= 0 else bucket)
+            continue
+        buckets = [[] for _ in range(RADIX_MASK + 1)]
+        for k in bucket:
+            buckets[(k >> shift) & RADIX_MASK].append(k)
+        for sub in reversed(buckets):
+            if sub:
+                stack.append((sub, shift - RADIX_BITS))
+    a[:] = decode(out)
+    return a
+
+# --- Adaptive Dispatch ---
+# auto_sort looks at an O(sqrt(n)) sample of its input, guesses which of the
+# distributions.py shapes it is and hands it to the algorithm that won that
+# shape at the nearest N in this machine's stored competition results.
+
+def _timsort(a):
+    # Power Sort without its non-negative guard: a sample can't prove that
+    # there are no negative numbers
+    a.sort()
+    return a
+
+# label -> function auto_sort may dispatch to
+AUTO_CANDIDATES = {
+    "Insertion Sort": insertion_sort,
+    "Merge Sort": merge_sort,
+    "Quick Sort": quick_sort,
+    "Power Sort": _timsort,
+    "LSD Radix Sort": lsd_radix_sort,
+    "MSD Radix Sort": msd_radix_sort,
+    "Adaptive Counting Sort": counting_sort_adaptive,
+}
+
+# candidates that only work on numbers (they raise TypeError before touching
+# the list otherwise, and auto_sort falls back to AUTO_DEFAULT)
+NUMERIC_ONLY = {"LSD Radix Sort", "MSD Radix Sort", "Adaptive Counting Sort"}
+
+# used for shapes (and N) the stored results say nothing about
+AUTO_DEFAULT = "Power Sort"
 
+# {shape: {N: label}}: from N on (up to the next listed N) use label.
+# Empty until there are stored results: every shape uses AUTO_DEFAULT, and
+# calibrate_decision_table() fills in the shapes this CPU's runs measured.
+DEFAULT_DECISION_TABLE = {}
+
+# keys further apart than this count as the wide64 shape
+WIDE_KEY_RANGE = 2 ** 32
+
+# below this N sampling would cost more than the sort: use AUTO_DEFAULT
+AUTO_SAMPLE_MIN = 64
+
+_decision_table = None
+
+def sample_features(a):
+    """Estimates the shape of a from about 2 * sqrt(n) elements.
+
+    One element per block of ~sqrt(n) (jittered inside the block so periodic
+    inputs don't alias) gives the key range, the share of duplicates and the
+    global order; the pairs those elements start give the local order (runs).
+    """
+    n = len(a)
+    step = max(1, n // max(1, math.isqrt(n)))
+    positions = [j * step + (j * 7919) % step for j in range(n // step)]
+    strided = [a[i] for i in positions]
+    pairs = [(a[i], a[i + 1]) for i in positions if i + 1 < n]
+    strided_pairs = list(zip(strided, strided[1:]))
+    # Direction changes along the strided sample (organ pipe has one)
+    signs = [(x < y) - (x > y) for x, y in strided_pairs]
+    signs = [s for s in signs if s]
+    numeric = all(isinstance(x, (int, float)) for x in strided)
+    return {
+        'n': n,
+        'sample_size': len(strided),
+        'numeric': numeric,
+        'key_range': max(strided) - min(strided) if numeric else None,
+        'distinct': len(set(strided)),
+        'dup_ratio': 1 - len(set(strided)) / len(strided),
+        'local_asc': sum(x <= y for x, y in pairs) / max(1, len(pairs)),
+        'local_desc': sum(x >= y for x, y in pairs) / max(1, len(pairs)),
+        'strided_asc': sum(x <= y for x, y in strided_pairs) / max(1, len(strided_pairs)),
+        'strided_desc': sum(x >= y for x, y in strided_pairs) / max(1, len(strided_pairs)),
+        'turns': sum(1 for s, t in zip(signs, signs[1:]) if s != t),
+    }
+
+def classify(features):
+    """Name of the distributions.py shape the sampled features look like."""
+    if features['distinct'] == 1:
+        return "all_equal"
+    if features['numeric'] and features['key_range'] > WIDE_KEY_RANGE:
+        return "wide64"
+    if features['strided_asc'] >= 0.95:
+        return "sorted" if features['local_asc'] == 1 else "nearly_sorted"
+    if features['strided_desc'] >= 0.95:
+        return "reverse"
+    if features['turns'] <= 2 and features['local_asc'] + features['local_desc'] >= 0.99:
+        return "organ_pipe"
+    if features['local_asc'] >= 0.9:
+        return "sawtooth"
+    if features['distinct'] <= min(2 * distributions.FEW_UNIQUE_KEYS, features['sample_size'] // 4):
+        return "few_unique"
+    if features['dup_ratio'] >= 0.4:
+        return "zipf"
+    return "random"
+
+def calibrate_decision_table(records=None):
+    """{shape: {N: label}} with the candidate of lowest median time for every
+    (distribution, N) measured on this CPU, on top of DEFAULT_DECISION_TABLE.
+    Only points where AUTO_DEFAULT was measured too count, so a candidate
+    replaces the default only by beating it."""
+    records = results_store.load() if records is None else records
+    cpu = results_store.cpu_model()
+    medians = {}
+    for r in records:
+        if r['algorithm'] in AUTO_CANDIDATES and r.get('distribution') and r.get('cpu') == cpu:
+            medians.setdefault((r['distribution'], r['n']), {}).setdefault(r['algorithm'], []).append(r['median'])
+
+    table = {shape: dict(by_n) for shape, by_n in DEFAULT_DECISION_TABLE.items()}
+    calibrated = {}
+    for (distribution, n), by_label in medians.items():
+        if AUTO_DEFAULT not in by_label:
+            continue
+        # Several runs of the same algorithm: judge it by its typical run
+        best = min(by_label, key=lambda label: statistics.median(by_label[label]))
+        calibrated.setdefault(distribution, {})[n] = best
+    table.update(calibrated)
+    return table
+
+def decide(features, table):
+    """Label to use for the sampled input: the table entry of its shape at
+    the largest listed N <= n (the smallest listed N for tiny inputs)."""
+    by_n = table.get(classify(features))
+    if not by_n:
+        return AUTO_DEFAULT
+    listed = sorted(by_n)
+    below = [m for m in listed if m <= features['n']]
+    return by_n[below[-1] if below else listed[0]]
+
+@instrument.unobserved("moves")
+def auto_sort(a):
+    """Samples the input, then sorts it with the algorithm the decision
+    table (calibrated from stored results) picks for its size and shape."""
+    global _decision_table
+    if len(a) < AUTO_SAMPLE_MIN:
+        return AUTO_CANDIDATES[AUTO_DEFAULT](a)
+    if _decision_table is None:
+        _decision_table = calibrate_decision_table()
+    features = sample_features(a)
+    label = decide(features, _decision_table)
+    if label in NUMERIC_ONLY:
+        # No full pass to check the type: the sample says numbers, the sort finds out
+        if features['numeric']:
+            try:
+                return AUTO_CANDIDATES[label](a)
+            except TypeError:
+                pass
+        label = AUTO_DEFAULT
+    return AUTO_CANDIDATES[label](a)
+
+# --- Test and Timing Functions ---
+
+def run_single_test(sort_f, l, totals=None):
+    """Times a sorting function (warm-up, calibrated inner loop, repeated samples)."""
+    return harness.measure(sort_f, l, repeats=REPEATS, warmup=WARMUP, totals=totals)
+
+def run_trial(sort_funcs, labels, active_indices, t_l, t_a=None):
+    """Runs one trial (every active algorithm on the same list).
+
+    Numpy backends get t_a, the same numbers as a typed numpy array.
+
+    Returns the winner's label (TIE when no algorithm is significantly
+    faster than all the others), the timing samples of each label and the
+    sort time / harness overhead totals.
+    """
+    samples = {}
+    totals = {}
+    # Only time the active algorithms; the input is shared, each sort gets its own copy
+    for i in active_indices:
+        data = t_a if numpy_backends.is_numpy_sort(sort_funcs[i]) else t_l
+        samples[labels[i]] = run_single_test(sort_funcs[i], data, totals)
+
+    if not samples: return None, samples, totals
+
+    winner = harness.decide_winner(samples, ALPHA)
+    return (winner if winner is not None else TIE), samples, totals
+
+# --- Worker Process Functions ---
+
+_worker_state = {}
+
+def _init_worker(sort_funcs, labels, input_pool, np_input_pool, core_counter):
+    """Stores the shared competition data in the worker and pins it to one core."""
+    _worker_state['sort_funcs'] = sort_funcs
+    _worker_state['labels'] = labels
+    _worker_state['input_pool'] = input_pool
+    _worker_state['np_input_pool'] = np_input_pool
+
+    # Pinning is only available on Linux; elsewhere the OS schedules freely
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    with core_counter.get_lock():
+        worker_index = core_counter.value
+        core_counter.value += 1
+    cores = sorted(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, {cores[worker_index % len(cores)]})
+
+def _worker_trial(task):
+    """Runs the (N, run) trial described by task inside a worker process."""
+    n, active_indices = task
+    t_l = _worker_state['input_pool'].get(n)
+    t_a = _worker_state['np_input_pool'].get(n)
+    return run_trial(_worker_state['sort_funcs'], _worker_state['labels'], active_indices, t_l, t_a)
+
+def build_input_pools(distribution, Ns, use_numpy=False):
+    """Stages the list input (N <= PYTHON_MAX_N) and, if needed, the numpy
+    input of every N once for the given distribution."""
+    python_Ns = [n for n in Ns if n <= PYTHON_MAX_N]
+    if not use_numpy:
+        return distributions.make_input_pool(distribution, python_Ns, M, SEED), {}
+
+    np_input_pool = {}
     for n in Ns:
-        print(f"N = {n}: Running {num_runs} competitions...")
-        win_counts[n] = {label: 0 for label in labels}
+        if distribution == "random":
+            # Production-sized uniform inputs are generated by numpy directly
+            np_input_pool[n] = numpy_backends.random_array(n, 1, M, NUMPY_DTYPE, SEED)
+        else:
+            np_input_pool[n] = numpy_backends.to_array(distributions.generate(distribution, n, M, SEED), NUMPY_DTYPE)
+    # The list-based algorithms get exactly the same numbers
+    input_pool = {n: np_input_pool[n].tolist() for n in python_Ns}
+    return input_pool, np_input_pool
+
+def run_competition(sort_funcs, labels, Ns, input_pool, num_runs, num_workers=1, np_input_pool=None, distribution=None,
+                    all_samples=None, all_counts=None, skipped=None):
+    """Runs a head-to-head competition for the selected algorithms.
+
+    input_pool maps each N to its list input (list-based algorithms skip the
+    N that are missing) and np_input_pool to the numpy array for the numpy
+    backends. With num_workers > 1 the independent (N, run) trials are
+    spread across a process pool, one worker per core, and the wins are
+    merged back here. If all_samples is given it is filled with the timing
+    samples as {N: {label: samples}}, and all_counts (with INSTRUMENT on)
+    with the operation counters of the list-based algorithms as
+    {N: {label: counters}}. skipped ({label: set of N}, see sweep.py) keeps
+    algorithms out of the N where they are predicted to be hopeless.
+    """
+    win_counts = {}
+    all_samples = {} if all_samples is None else all_samples
+    totals = {'sort': 0.0, 'overhead': 0.0}
+    np_input_pool = np_input_pool or {}
+    skipped = skipped or {}
 
-        # Skip slow algorithms for large N to save time
-        active_indices = [i for i, label in enumerate(labels) if not (n > 5000 and label in slow_algorithms)]
-        if len(active_indices) < len(labels):
-            skipped_labels = [l for l in labels if l in slow_algorithms]
-            print(f"  (Skipping {', '.join(skipped_labels)} for N > 5000)")
+    # Generate header for the competition title
+    title_header = " vs ".join([label.upper() for label in labels])
+    shape = f", {distribution} input" if distribution else ""
+    print(f"\n--- Competition: {title_header} ({num_runs} Runs{shape}) ---")
+
+    pool = None
+    if num_workers > 1:
+        core_counter = multiprocessing.Value('i', 0)
+        pool = multiprocessing.Pool(num_workers, initializer=_init_worker,
+                                    initargs=(sort_funcs, labels, input_pool, np_input_pool, core_counter))
+        print(f"(Using {num_workers} worker processes)")
+
+    try:
+        for n in Ns:
+            print(f"N = {n}: Running {num_runs} competitions...")
+            win_counts[n] = {label: 0 for label in labels}
+            win_counts[n][TIE] = 0
+            all_samples[n] = {label: [] for label in labels}
+
+            # Skip algorithms predicted to be hopeless at this N to save time
+            active_indices = [i for i, label in enumerate(labels) if n not in skipped.get(label, ())]
+            for label in labels:
+                if n in skipped.get(label, ()):
+                    print(f"  (Skipping {label} at N = {n}: predicted too slow)")
+
+            # List-based algorithms only run while the list input is available
+            if n not in input_pool:
+                python_labels = [labels[i] for i in active_indices if not numpy_backends.is_numpy_sort(sort_funcs[i])]
+                if python_labels:
+                    print(f"  (Skipping {', '.join(python_labels)} for N > {PYTHON_MAX_N})")
+                active_indices = [i for i in active_indices if numpy_backends.is_numpy_sort(sort_funcs[i])]
+
+            # If all selected algorithms are slow and skipped, continue to next N
+            if not active_indices:
+                continue
+
+            if pool is None:
+                t_l, t_a = input_pool.get(n), np_input_pool.get(n)
+                winners = (run_trial(sort_funcs, labels, active_indices, t_l, t_a) for _ in range(num_runs))
+            else:
+                tasks = [(n, active_indices)] * num_runs
+                winners = pool.imap_unordered(_worker_trial, tasks)
+
+            # Award the wins
+            for winner, samples, trial_totals in winners:
+                if winner is not None:
+                    win_counts[n][winner] += 1
+                for key, value in trial_totals.items():
+                    totals[key] += value
+                for label, label_samples in samples.items():
+                    all_samples[n][label].extend(label_samples)
+
+            # Print intermediate results for the current N
+            result_line = ", ".join([f"{label}: {win_counts[n][label]}" for label in labels + [TIE]])
+            print(f"  Completed. Wins -> {result_line}")
+            for label in labels:
+                if all_samples[n][label]:
+                    stats = harness.summarize(all_samples[n][label])
+                    line = f"  {label:<16} {harness.format_summary(stats)}"
+                    if REPORT_MEMORY:
+                        sort_f = sort_funcs[labels.index(label)]
+                        data = np_input_pool[n] if numpy_backends.is_numpy_sort(sort_f) else input_pool[n]
+                        line += f"  peak {harness.format_bytes(harness.measure_peak_memory(sort_f, data))}"
+                    print(line)
+            if INSTRUMENT and all_counts is not None and n in input_pool:
+                all_counts[n] = {labels[i]: instrument.count_operations(sort_funcs[i], input_pool[n])
+                                 for i in active_indices if not numpy_backends.is_numpy_sort(sort_funcs[i])}
+            print("-" * 20)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    print(f"Timing: {harness.format_overhead(totals)}")
+    return win_counts
 
-        # If all selected algorithms are slow and skipped, continue to next N
-        if not active_indices:
+def fit_skipped_sizes(sort_funcs, labels, Ns, distribution, budget):
+    """Budgeted sweep of the list-based algorithms on one distribution;
+    returns the N of Ns each of them sits out (see sweep.py)."""
+    print(f"\n--- Adaptive Sweep ({budget}s per algorithm, {distribution} input) ---")
+    fitted = [(f, label) for f, label in zip(sort_funcs, labels) if not numpy_backends.is_numpy_sort(f)]
+    models, points = sweep.fit_models([f for f, _ in fitted], [label for _, label in fitted],
+                                      lambda n: distributions.generate(distribution, n, M, SEED), budget)
+    skipped = sweep.skipped_sizes(models, Ns, SKIP_FACTOR, SKIP_TIME)
+    sweep.print_crossovers(models, points, skipped)
+    return skipped
+
+def run_distribution_sweep(sort_funcs, labels, Ns, distribution_names, num_runs, num_workers=1, counts_by_distribution=None,
+                           sweep_budget=0):
+    """Runs the competition once per input distribution.
+
+    Returns {distribution: win_counts} and the timing samples as
+    {(label, N, distribution): samples}. Counting sorts sit out the
+    distributions whose key range is too wide for them. With INSTRUMENT on,
+    counts_by_distribution is filled with {distribution: {N: {label: counters}}}.
+    With a sweep_budget, every distribution first gets its own complexity
+    fit, so an algorithm is only skipped where it is slow on that input.
+    """
+    samples_by_key = {}
+    use_numpy = any(numpy_backends.is_numpy_sort(f) for f in sort_funcs)
+    small_range_only = {"Counting Sort", "NumPy Counting Sort"}
+    sweep_wins = {}
+    for distribution in distribution_names:
+        if use_numpy and NUMPY_DTYPE != "int64" and distribution in distributions.NEEDS_INT64:
+            # Clamping would make it a different distribution; leave it out instead
+            print(f"\n(Skipping {distribution} input: its values do not fit NUMPY_DTYPE = {NUMPY_DTYPE})")
+            continue
+        funcs, dist_labels = sort_funcs, labels
+        if distribution in distributions.WIDE_RANGE:
+            kept = [i for i, label in enumerate(labels) if label not in small_range_only]
+            if len(kept) < len(labels):
+                print(f"\n(Skipping {', '.join(l for l in labels if l in small_range_only)} for {distribution} input)")
+            funcs = [sort_funcs[i] for i in kept]
+            dist_labels = [labels[i] for i in kept]
+        if not funcs:
             continue
 
-        for _ in range(num_runs):
-            t_l = init_l[:n]
-            times = []
-            # Only time the active algorithms
-            for i in active_indices:
-                times.append(run_single_test(sort_funcs[i], t_l))
+        skipped = fit_skipped_sizes(funcs, dist_labels, Ns, distribution, sweep_budget) if sweep_budget else {}
 
-            if not times: continue
+        input_pool, np_input_pool = build_input_pools(distribution, Ns, use_numpy)
+        all_samples, all_counts = {}, {}
+        sweep_wins[distribution] = run_competition(funcs, dist_labels, Ns, input_pool, num_runs,
+                                                   num_workers, np_input_pool, distribution, all_samples, all_counts,
+                                                   skipped)
+        if counts_by_distribution is not None and all_counts:
+            counts_by_distribution[distribution] = all_counts
+        for n, by_label in all_samples.items():
+            for label, samples in by_label.items():
+                samples_by_key[(label, n, distribution)] = samples
+    return sweep_wins, samples_by_key
 
-            min_time = min(times)
-            # Find the original index of the winner
-            winner_original_index = active_indices[times.index(min_time)]
+def print_win_table(win_counts, labels, Ns, title):
+    print(f"\n\n--- {title} ---")
 
-            # Award the win
-            win_counts[n][labels[winner_original_index]] += 1
+    # Dynamic header
+    header = f"{'N':<8} | " + " | ".join([f"{label.upper()+' WINS':<20}" for label in labels] + [f"{'TIES':<20}"])
+    print("=" * len(header))
+    print(header)
+    print("=" * len(header))
 
-        # Print intermediate results for the current N
-        result_line = ", ".join([f"{label}: {win_counts[n][label]}" for label in labels])
-        print(f"  Completed. Wins -> {result_line}")
-        print("-" * 20)
+    # Dynamic rows
+    for n in Ns:
+        results = win_counts.get(n, {})
+        row_data = [f"{results.get(label, 0):<20}" for label in labels + [TIE]]
+        print(f"{n:<8} | " + " | ".join(row_data))
 
-    return win_counts
+    print("=" * len(header))
+
+def print_best_by_distribution(sweep_wins, Ns, samples_by_key):
+    """One row per distribution: the algorithm with most wins at each N
+    (several joined by "/" if they share the most wins). Where nothing won
+    significantly, the fastest by median is shown marked "(n.s.)"."""
+    print("\n\n--- Best Algorithm per Input Distribution ---")
+    header = f"{'DISTRIBUTION':<14} | " + " | ".join([f"{'N = ' + str(n):<28}" for n in Ns])
+    print("=" * len(header))
+    print(header)
+    print("=" * len(header))
+    for distribution, win_counts in sweep_wins.items():
+        row_data = []
+        for n in Ns:
+            results = {label: wins for label, wins in win_counts.get(n, {}).items() if label != TIE}
+            most = max(results.values(), default=0)
+            if most:
+                best = "/".join(label for label, wins in results.items() if wins == most)
+            else:
+                medians = {label: harness.summarize(samples)['median']
+                           for (label, key_n, key_distribution), samples in samples_by_key.items()
+                           if key_n == n and key_distribution == distribution}
+                best = f"{min(medians, key=medians.get)} (n.s.)" if medians else "-"
+            row_data.append(f"{best:<28}")
+        print(f"{distribution:<14} | " + " | ".join(row_data))
+    print("=" * len(header))
 
 # --- Main Execution ---
 if __name__ == "__main__":
@@ -181,8 +850,14 @@ if __name__ == "__main__":
         '4': ("Merge Sort", merge_sort),
         '5': ("Quick Sort", quick_sort),
         '6': ("Power Sort", power_sort),
-        '7': ("Counting Sort", counting_sort)
+        '7': ("Counting Sort", counting_sort),
+        '8': ("LSD Radix Sort", lsd_radix_sort),
+        '9': ("MSD Radix Sort", msd_radix_sort),
+        '10': ("Adaptive Counting Sort", counting_sort_adaptive),
+        '11': ("Auto Sort", auto_sort)
     }
+    if numpy_backends.np is not None:
+        SORTING_ALGORITHMS.update(numpy_backends.NUMPY_SORTING_ALGORITHMS)
 
     # --- User Selection ---
     print("=== Sorting Algorithm Competition ===")
@@ -196,29 +871,50 @@ if __name__ == "__main__":
             break
         except KeyError as e:
             print(f"Invalid selection: {e}. Please choose numbers from the list.")
+            if str(e).strip("'").startswith("np") and numpy_backends.np is None:
+                print("The NumPy backends need numpy: pip install numpy")
+            sys.exit(1)
         except Exception as e:
             print(f"An error occurred: {e}")
+            sys.exit(1)
 
-    # --- Setup and Run ---
-    MAX_N = max(Ns)
-    # Ensure all numbers are positive for Power Sort and Counting Sort
-    init_l = [random.randint(1, M) for _ in range(MAX_N)]
-
-    final_wins = run_competition(chosen_funcs, chosen_labels, Ns, init_l, NUM_RUNS)
-
-    # --- Final Results Table ---
-    print("\n\n--- Final Competition Results (Total Wins) ---")
+    # Too few samples and every pair ends up a tie
+    warning = harness.repeats_warning(REPEATS, ALPHA)
+    if warning:
+        print(warning)
 
-    # Dynamic header
-    header = f"{'N':<8} | " + " | ".join([f"{label.upper()+' WINS':<20}" for label in chosen_labels])
-    print("=" * len(header))
-    print(header)
-    print("=" * len(header))
-
-    # Dynamic rows
-    for n in Ns:
-        results = final_wins.get(n, {})
-        row_data = [f"{results.get(label, 0):<20}" for label in chosen_labels]
-        print(f"{n:<8} | " + " | ".join(row_data))
-
-    print("=" * len(header))
+    # --- Setup and Run ---
+    # All inputs are positive (Power Sort and Counting Sort need that) and a
+    # fixed SEED gives the same inputs (and the same trials) for any NUM_WORKERS
+    counts_by_distribution = {}
+    sweep_wins, samples_by_key = run_distribution_sweep(chosen_funcs, chosen_labels, Ns, DISTRIBUTIONS, NUM_RUNS, NUM_WORKERS,
+                                                        counts_by_distribution, SWEEP_BUDGET)
+
+    # --- Final Results Tables ---
+    for distribution, final_wins in sweep_wins.items():
+        print_win_table(final_wins, chosen_labels, Ns, f"Final Competition Results: {distribution} input (Total Wins)")
+        if distribution in counts_by_distribution:
+            instrument.print_counter_table(counts_by_distribution[distribution], chosen_labels, Ns,
+                                           f"Operation Counts: {distribution} input")
+
+    if len(sweep_wins) > 1:
+        print_best_by_distribution(sweep_wins, Ns, samples_by_key)
+
+    # Parallel merge sort on the largest N the list-based algorithms ran at
+    n = max((size for size in Ns if size <= PYTHON_MAX_N), default=None)
+    if PARALLEL_CORES and n is None:
+        print(f"\n(Skipping the parallel speedup table: no N <= PYTHON_MAX_N = {PYTHON_MAX_N})")
+    elif PARALLEL_CORES:
+        curve = parallel_sort.speedup_curve(distributions.generate("random", n, M, SEED), PARALLEL_CORES,
+                                            globals()[PARALLEL_CHUNK_SORT], REPEATS)
+        baselines = {label: harness.summarize(samples)['median']
+                     for (label, size, distribution), samples in samples_by_key.items()
+                     if size == n and distribution == "random"}
+        parallel_sort.print_speedup_table(curve, n, baselines)
+        for cores, samples in curve.items():
+            samples_by_key[(f"Parallel Merge Sort x{cores}", n, "random")] = samples
+
+    if SAVE_RESULTS:
+        run_id = results_store.save_run("competition", samples_by_key)
+        print(f"\nResults saved as run {run_id} in {results_store.RESULTS_FILE}")
+        print("Compare with an earlier run: python results_store.py compare")
@@ -0,0 +1,91 @@
+import bisect
+import itertools
+import math
+import random
+
+# --- Input Distributions ---
+# Every generator takes (n, rng, m) and returns a list of n ints in [1, m]
+# (wide64 ignores m). rng is a random.Random so inputs are reproducible.
+
+def random_uniform(n, rng, m):
+    return [rng.randint(1, m) for _ in range(n)]
+
+def sorted_input(n, rng, m):
+    return sorted(random_uniform(n, rng, m))
+
+def reverse_sorted(n, rng, m):
+    return sorted(random_uniform(n, rng, m), reverse=True)
+
+# fraction of positions swapped in nearly_sorted
+NEARLY_SORTED_SWAP_RATE = 0.01
+
+def nearly_sorted(n, rng, m):
+    """Sorted input with k = 1% of n random swaps."""
+    a = sorted_input(n, rng, m)
+    if n < 2: return a
+    for _ in range(max(1, int(n * NEARLY_SORTED_SWAP_RATE))):
+        i, j = rng.randrange(n), rng.randrange(n)
+        a[i], a[j] = a[j], a[i]
+    return a
+
+def sawtooth(n, rng, m):
+    """Ascending teeth of length ~sqrt(n)."""
+    period = max(1, math.isqrt(n))
+    step = max(1, m // period)
+    return [1 + (i % period) * step for i in range(n)]
+
+def organ_pipe(n, rng, m):
+    """Ascending first half, descending second half."""
+    half = (n + 1) // 2
+    up = [1 + i * (m - 1) // max(1, half - 1) for i in range(half)]
+    return up + up[:n - half][::-1]
+
+# number of distinct keys in few_unique
+FEW_UNIQUE_KEYS = 8
+
+def few_unique(n, rng, m):
+    keys = [rng.randint(1, m) for _ in range(FEW_UNIQUE_KEYS)]
+    return [rng.choice(keys) for _ in range(n)]
+
+def all_equal(n, rng, m):
+    return [rng.randint(1, m)] * n
+
+# exponent of the Zipf distribution (value k has weight 1 / k**s)
+ZIPF_S = 1.1
+
+def zipfian(n, rng, m):
+    cumulative = list(itertools.accumulate(1 / k ** ZIPF_S for k in range(1, m + 1)))
+    total = cumulative[-1]
+    return [bisect.bisect_left(cumulative, rng.random() * total) + 1 for _ in range(n)]
+
+def wide64(n, rng, m):
+    """Values spread over the whole positive 64-bit range."""
+    return [rng.randint(1, 2 ** 63 - 1) for _ in range(n)]
+
+DISTRIBUTIONS = {
+    "random": random_uniform,
+    "sorted": sorted_input,
+    "reverse": reverse_sorted,
+    "nearly_sorted": nearly_sorted,
+    "sawtooth": sawtooth,
+    "organ_pipe": organ_pipe,
+    "few_unique": few_unique,
+    "all_equal": all_equal,
+    "zipf": zipfian,
+    "wide64": wide64,
+}
+
+# distributions whose key range is far too large for counting sort
+WIDE_RANGE = {"wide64"}
+
+# distributions whose values need 64-bit integers (they overflow int32)
+NEEDS_INT64 = {"wide64"}
+
+def generate(name, n, m, seed=None):
+    """n values from distribution `name`; the same (name, n, seed) gives the same list."""
+    rng = random.Random(None if seed is None else f"{seed}-{name}-{n}")
+    return DISTRIBUTIONS[name](n, rng, m)
+
+def make_input_pool(name, Ns, m, seed=None):
+    """Generates the input of every N once, to be reused by all runs and algorithms."""
+    return {n: generate(name, n, m, seed) for n in Ns}
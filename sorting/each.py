@@ -1,10 +1,10 @@
-import random
-import time
-import copy
-import sys
 import math # Added for power sort
 
-sys.setrecursionlimit(3000)
+import harness
+import instrument
+import sweep
+import distributions
+import results_store
 
 # --- Sorting Algorithm Definitions ---
 
@@ -19,34 +19,71 @@ def selection_sort(a):
   return a
 
 def merge_sort(a):
-  if len(a) > 1:
-    mid = len(a) // 2
-    L = a[:mid]
-    R = a[mid:]
-
-    merge_sort(L)
-    merge_sort(R)
-
-    i = j = k = 0
-
-    while i < len(L) and j < len(R):
-      if L[i] <= R[j]:
-        a[k] = L[i]
-        i += 1
+  """Bottom-up natural merge sort.
+
+  Starts from the runs already present in the input (strictly descending
+  runs are reversed in place, so reverse-sorted input is one run) and
+  merges neighbouring runs pass by pass, ping-ponging between a and one
+  auxiliary buffer that is allocated once. Two runs that are already in
+  order are copied instead of merged, so sorted input costs a single pass.
+  Elements are copied one index at a time: no slice makes a temporary list.
+  """
+  n = len(a)
+  if n < 2: return a
+
+  # Start of every maximal run, plus the end
+  bounds = [0]
+  start = 0
+  while start < n:
+    end = start + 1
+    if end < n and a[end] < a[start]:
+      # Strictly descending only, so reversing keeps equal keys in order
+      while end < n and a[end] < a[end - 1]:
+        end += 1
+      lo, hi = start, end - 1
+      while lo < hi:
+        a[lo], a[hi] = a[hi], a[lo]
+        lo += 1; hi -= 1
+    else:
+      while end < n and not a[end] < a[end - 1]:
+        end += 1
+    bounds.append(end)
+    start = end
+  if len(bounds) == 2: return a
+
+  # The buffer has the input's type so instrument.py sees its writes too
+  src, dst = a, type(a)([None] * n)
+  while len(bounds) > 2:
+    merged_bounds = [0]
+    for r in range(0, len(bounds) - 1, 2):
+      lo = bounds[r]
+      if r + 2 >= len(bounds):
+        # Odd run out: carry it over to the other buffer
+        for k in range(lo, n):
+          dst[k] = src[k]
+        merged_bounds.append(n)
+        break
+      mid, hi = bounds[r + 1], bounds[r + 2]
+      if src[mid - 1] <= src[mid]:
+        for k in range(lo, hi):
+          dst[k] = src[k]
       else:
-        a[k] = R[j]
-        j += 1
-      k += 1
-
-    while i < len(L):
-      a[k] = L[i]
-      i += 1
-      k += 1
-
-    while j < len(R):
-      a[k] = R[j]
-      j += 1
-      k += 1
+        i, j, k = lo, mid, lo
+        while i < mid and j < hi:
+          if src[j] < src[i]: dst[k] = src[j]; j += 1
+          else: dst[k] = src[i]; i += 1
+          k += 1
+        while i < mid:
+          dst[k] = src[i]; i += 1; k += 1
+        while j < hi:
+          dst[k] = src[j]; j += 1; k += 1
+      merged_bounds.append(hi)
+    src, dst = dst, src
+    bounds = merged_bounds
+
+  if src is not a:
+    for k in range(n):
+      a[k] = src[k]
   return a
 
 def insertion_sort(a):
@@ -67,27 +104,107 @@ def bubble_sort(a):
         a[j], a[j + 1] = a[j + 1], a[j]
   return a
 
-def quick_sort_helper(a, low, high):
-  if low < high:
-    pi = partition(a, low, high)
-    quick_sort_helper(a, low, pi - 1)
-    quick_sort_helper(a, pi + 1, high)
-
-def partition(a, low, high):
-  pivot = a[high]
-  i = low - 1
-  for j in range(low, high):
-    if a[j] <= pivot:
-      i = i + 1
-      a[i], a[j] = a[j], a[i]
-  a[i + 1], a[high] = a[high], a[i + 1]
-  return i + 1
+# Partitions at or below this size are finished by insertion sort
+INSERTION_CUTOFF = 16
 
 def quick_sort(a):
-  quick_sort_helper(a, 0, len(a) - 1)
+  """Iterative introsort.
+
+  Ninther/median-of-three pivots, three-way (Dutch flag) partitioning so
+  runs of equal keys are finished in one pass, insertion sort for small
+  partitions and heapsort once the depth limit is hit. The larger side is
+  pushed on an explicit stack, so the stack stays O(log n) and no recursion
+  limit is involved.
+  """
+  n = len(a)
+  if n < 2: return a
+  stack = [(0, n - 1, 2 * n.bit_length())]
+  while stack:
+    low, high, depth = stack.pop()
+    while high - low + 1 > INSERTION_CUTOFF:
+      if depth == 0:
+        heap_sort_range(a, low, high)
+        break
+      depth -= 1
+      lt, gt = partition3(a, low, high, choose_pivot(a, low, high))
+      # Keep working on the smaller side, defer the larger one
+      if lt - low < high - gt:
+        stack.append((gt + 1, high, depth))
+        high = lt - 1
+      else:
+        stack.append((low, lt - 1, depth))
+        low = gt + 1
+    else:
+      insertion_sort_range(a, low, high)
   return a
 
+def median_of_three(a, i, j, k):
+  x, y, z = a[i], a[j], a[k]
+  if x < y:
+    if y < z: return y
+    return z if x < z else x
+  if x < z: return x
+  return z if y < z else y
+
+def choose_pivot(a, low, high):
+  """Median of three for small ranges, Tukey's ninther for large ones."""
+  mid = (low + high) // 2
+  if high - low < 40:
+    return median_of_three(a, low, mid, high)
+  s = (high - low) // 8
+  return sorted((median_of_three(a, low, low + s, low + 2 * s),
+                 median_of_three(a, mid - s, mid, mid + s),
+                 median_of_three(a, high - 2 * s, high - s, high)))[1]
+
+def partition3(a, low, high, pivot):
+  """Dutch flag partition of a[low..high]; returns (lt, gt) so that
+  a[low..lt-1] < pivot, a[lt..gt] == pivot and a[gt+1..high] > pivot."""
+  lt, i, gt = low, low, high
+  while i <= gt:
+    x = a[i]
+    if x < pivot:
+      a[i] = a[lt]; a[lt] = x
+      lt += 1; i += 1
+    elif x > pivot:
+      a[i] = a[gt]; a[gt] = x
+      gt -= 1
+    else:
+      i += 1
+  return lt, gt
+
+def insertion_sort_range(a, low, high):
+  for i in range(low + 1, high + 1):
+    key = a[i]
+    j = i - 1
+    while j >= low and key < a[j]:
+      a[j + 1] = a[j]
+      j -= 1
+    a[j + 1] = key
+
+def heap_sort_range(a, low, high):
+  """In-place heapsort of a[low..high] (introsort's worst-case fallback)."""
+  n = high - low + 1
+  for start in range(n // 2 - 1, -1, -1):
+    sift_down(a, low, start, n)
+  for end in range(n - 1, 0, -1):
+    a[low], a[low + end] = a[low + end], a[low]
+    sift_down(a, low, 0, end)
+
+def sift_down(a, base, root, size):
+  item = a[base + root]
+  child = 2 * root + 1
+  while child < size:
+    if child + 1 < size and a[base + child] < a[base + child + 1]:
+      child += 1
+    if not item < a[base + child]:
+      break
+    a[base + root] = a[base + child]
+    root = child
+    child = 2 * root + 1
+  a[base + root] = item
+
 # --- New Algorithm: Power Sort ---
+@instrument.unobserved("comparisons", "moves")
 def power_sort(a):
   """
   NOTE: This is NOT a standard or practical sorting algorithm.
@@ -114,75 +231,125 @@ def power_sort(a):
 
 # --- Test and Timing Function ---
 
-def test_sort(sort_f, label, Ns, init_l, results_d):
+def test_sort(sort_f, label, Ns, input_pool, results_d, totals=None, counts_d=None, skipped=()):
   print(f"{label}:")
   for n in Ns:
-    # Stop testing inefficient algorithms on large lists
-    if n > 5000 and label in ["selection sort", "insertion sort", "bubble sort"]:
-        print(f"({n}) Skipped (too slow)")
-        continue
+    # Leave out the N where the fitted model predicts the algorithm is hopeless (see sweep.py)
+    if n in skipped:
+      print(f"({n}) Skipped (predicted too slow)")
+      continue
+
+    # Staged once per N and shared by every algorithm; the harness copies it per sort
+    t_l = input_pool[n]
 
-    t_l = init_l[:n]
-    l_to_sort = copy.deepcopy(t_l)
+    # Warm-up, calibrated inner loop and repeated samples instead of one call
+    samples = harness.measure(sort_f, t_l, totals=totals)
+    stats = harness.summarize(samples)
 
-    start = time.perf_counter()
-    sort_f(l_to_sort)
-    end = time.perf_counter()
-    time_taken = end - start
+    peak = harness.measure_peak_memory(sort_f, t_l)
 
-    print(f"({n}) {time_taken:.6f}")
+    print(f"({n}) {harness.format_summary(stats)}  peak {harness.format_bytes(peak)}")
+
+    # Untimed instrumented run (see instrument.py)
+    if counts_d is not None:
+      counts = instrument.count_operations(sort_f, t_l)
+      counts_d.setdefault(n, {})[label] = counts
+      print(f"     {counts['comparisons']} comparisons, {counts['moves']} moves, depth {counts['depth']}")
 
     # Store result for winner board
     if n not in results_d:
       results_d[n] = []
-    results_d[n].append((label, time_taken))
+    results_d[n].append((label, samples))
 
 # --- Main Execution ---
 
 if __name__ == "__main__":
   Ns = [10, 50, 100, 1000, 2000, 5000, 10000, 100000]
 
-  MAX_N = max(Ns)
   # Ensure all numbers are positive for power sort to work
   M = 1000
-  init_l = [random.randint(1, M) for _ in range(MAX_N)]
-
-  # Dictionary to store all results: {N: [(name, time), (name, time), ...]}
+  # Shape of the input: random, sorted, reverse, nearly_sorted, sawtooth,
+  # organ_pipe, few_unique, all_equal, zipf (see distributions.py)
+  DISTRIBUTION = "random"
+  SEED = None
+  # Also count comparisons, moves, call depth and allocations (untimed, see instrument.py)
+  INSTRUMENT = False
+  # Seconds per algorithm for the sweep whose fitted models decide which N each
+  # algorithm sits out (0 = no sweep, nothing is skipped)
+  SWEEP_BUDGET = 1.0
+  # An algorithm sits out an N where it is predicted SKIP_FACTOR times slower
+  # than another one, or where one sort is predicted to take over SKIP_TIME seconds
+  SKIP_FACTOR = 1000
+  SKIP_TIME = 0.5
+
+  # Comment out the ones you don't want to time
+  ALGORITHMS = [
+    #(selection_sort, "selection sort"),
+    (merge_sort, "merge sort"),
+    #(insertion_sort, "insertion sort"),
+    #(bubble_sort, "bubble sort"),
+    (quick_sort, "quick sort"),
+    (power_sort, "power sort"),
+  ]
+
+  # Every N gets its own list from the distribution, staged once
+  input_pool = distributions.make_input_pool(DISTRIBUTION, Ns, M, SEED)
+
+  # Dictionary to store all results: {N: [(name, samples), (name, samples), ...]}
   all_results = {}
+  totals = {'sort': 0.0, 'overhead': 0.0}
+  # {N: {name: counters}} when INSTRUMENT is on
+  all_counts = {} if INSTRUMENT else None
+
+  # Fit every algorithm's growth within the budget; the crossovers replace a fixed skip list
+  skipped = {}
+  if SWEEP_BUDGET:
+    print(f"--- Adaptive Sweep ({SWEEP_BUDGET}s per algorithm, {DISTRIBUTION} input) ---")
+    models, points = sweep.fit_models([f for f, _ in ALGORITHMS], [label for _, label in ALGORITHMS],
+                                      lambda n: distributions.generate(DISTRIBUTION, n, M, SEED), SWEEP_BUDGET)
+    skipped = sweep.skipped_sizes(models, Ns, SKIP_FACTOR, SKIP_TIME)
+    sweep.print_crossovers(models, points, skipped)
+    print()
 
   print("--- Sorting Algorithm Timing Comparison ---")
-
-  #test_sort(selection_sort, "selection sort", Ns, init_l, all_results)
+  # Too few samples and every lead is "n.s."
+  warning = harness.repeats_warning(harness.REPEATS)
+  if warning:
+    print(warning)
   print("-" * 20)
 
-  test_sort(merge_sort, "merge sort", Ns, init_l, all_results)
-  print("-" * 20)
-
-  #test_sort(insertion_sort, "insertion sort", Ns, init_l, all_results)
-  print("-" * 20)
-
-  #test_sort(bubble_sort, "bubble sort", Ns, init_l, all_results)
-  print("-" * 20)
-
-  test_sort(quick_sort, "quick sort", Ns, init_l, all_results)
-  print("-" * 20)
-
-  test_sort(power_sort, "power sort", Ns, init_l, all_results)
-  print("-" * 20)
+  for sort_f, label in ALGORITHMS:
+    test_sort(sort_f, label, Ns, input_pool, all_results, totals, all_counts, skipped.get(label, ()))
+    print("-" * 20)
 
 
   print("\n\n--- Winner Board ---")
-  print("=" * 45)
+  print("=" * 50)
 
   for n in Ns:
     results = all_results.get(n, [])
 
     if results:
-      fastest = min(results, key=lambda x: x[1])
+      samples_by_label = dict(results)
+      fastest = min(results, key=lambda x: harness.summarize(x[1])['median'])
       winner_name = fastest[0].upper()
-      winner_time = fastest[1]
-      print(f"N = {n:<6}: {winner_name:<20} (Time: {winner_time:.6f}s)")
+      winner_time = harness.summarize(fastest[1])['median']
+      # Only crown a winner whose lead is statistically significant
+      if harness.decide_winner(samples_by_label) is None:
+        winner_name += " (n.s.)"
+      print(f"N = {n:<6}: {winner_name:<20} (Median: {winner_time:.6f}s)")
     else:
       print(f"N = {n:<6}: No data available")
 
-  print("=" * 45)
\ No newline at end of file
+  print("=" * 50)
+  print(f"Timing: {harness.format_overhead(totals)}")
+
+  if all_counts:
+    labels = list(dict.fromkeys(label for n in Ns for label in all_counts.get(n, {})))
+    instrument.print_counter_table(all_counts, labels, Ns, "Operation Counts")
+
+  # Append this run to the results store (python results_store.py compare)
+  samples_by_key = {(label, n, DISTRIBUTION): samples
+                    for n, results in all_results.items() for label, samples in results}
+  run_id = results_store.save_run("each", samples_by_key)
+  print(f"Results saved as run {run_id}")
\ No newline at end of file
@@ -0,0 +1,232 @@
+import array
+import heapq
+import mmap
+import multiprocessing
+import os
+import tempfile
+import time
+
+import harness
+import distributions
+import results_store
+import competition
+
+# ==============================================================================
+# === USER CONFIGURATION ===
+# ==============================================================================
+# integers in the benchmark input file
+N_ITEMS = 5000000
+
+# element type of the binary files ("int32" or "int64", native byte order)
+DTYPE = "int64"
+
+# values are drawn from this distribution (see distributions.py)
+DISTRIBUTION = "random"
+
+# maximum value for random
+M = 1000000
+
+# integers sorted in RAM at a time (one run file per chunk)
+CHUNK_ITEMS = 1000000
+
+# read / write buffer per open file in the merge phase (bytes)
+BUFFER_SIZE = 1 << 20
+
+# most runs merged at once; more runs are merged in several passes, so open
+# files and buffer memory stay at MAX_FAN_IN + 1 whatever the file size
+MAX_FAN_IN = 64
+
+# in-memory algorithms (functions of competition.py) used for the chunks
+ALGORITHMS = ["merge_sort", "quick_sort", "counting_sort_adaptive", "power_sort"]
+
+# timed sorts per algorithm
+REPEATS = 3
+
+# seed for the input file
+SEED = 12345
+
+# append the timings to the results store (see results_store.py)
+SAVE_RESULTS = True
+# ==============================================================================
+# ==============================================================================
+
+
+# array typecode of each supported element type
+TYPECODES = {"int32": "i", "int64": "q"}
+
+# --- Binary Files ---
+
+def typecode(dtype):
+    code = TYPECODES[dtype]
+    if array.array(code).itemsize != int(dtype[3:]) // 8:
+        raise ValueError(f"No {dtype} array type on this platform.")
+    return code
+
+def write_input_file(path, n, dtype=DTYPE, distribution=DISTRIBUTION, m=M, seed=None, block_items=CHUNK_ITEMS):
+    """Writes n integers from `distribution` as a binary file.
+
+    The values are generated in one go, so order-dependent distributions
+    (sorted, nearly_sorted, sawtooth, ...) hold across the whole file rather
+    than within each block; this means the input has to fit in memory once,
+    while it is written (the sort itself never needs it all)."""
+    code = typecode(dtype)
+    values = distributions.generate(distribution, n, m, seed)
+    with open(path, "wb") as f:
+        for start in range(0, n, block_items):
+            array.array(code, values[start:start + block_items]).tofile(f)
+
+def read_values(path, dtype=DTYPE, buffer_size=BUFFER_SIZE):
+    """Yields the integers of a binary file, reading buffer_size bytes at a time."""
+    code = typecode(dtype)
+    itemsize = array.array(code).itemsize
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            data = f.read(buffer_size - buffer_size % itemsize)
+            if not data:
+                return
+            values = array.array(code)
+            values.frombytes(data)
+            yield from values
+
+def is_sorted_file(path, dtype=DTYPE):
+    previous = None
+    for x in read_values(path, dtype):
+        if previous is not None and x < previous:
+            return False
+        previous = x
+    return True
+
+# --- External Merge Sort ---
+
+def sort_runs(in_path, run_dir, sort_f, dtype=DTYPE, chunk_items=CHUNK_ITEMS):
+    """Phase 1: sorts the input chunk by chunk and writes every sorted chunk
+    to its own run file. The input is read through mmap, so only the chunk
+    being sorted is ever resident. Returns the run file paths."""
+    code = typecode(dtype)
+    itemsize = array.array(code).itemsize
+    chunk_bytes = chunk_items * itemsize
+    run_paths = []
+    if os.path.getsize(in_path) == 0:
+        return run_paths
+    with open(in_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, len(mm), chunk_bytes):
+            chunk = array.array(code)
+            chunk.frombytes(mm[start:start + chunk_bytes])
+            # The in-memory algorithms work on lists
+            values = sort_f(chunk.tolist())
+            run_path = os.path.join(run_dir, f"run{len(run_paths):05d}.bin")
+            with open(run_path, "wb") as run:
+                array.array(code, values).tofile(run)
+            run_paths.append(run_path)
+    return run_paths
+
+def merge_runs(run_paths, out_path, dtype=DTYPE, buffer_size=BUFFER_SIZE):
+    """Phase 2: k-way merges the sorted runs with a heap (heapq.merge).
+
+    Every run is read sequentially buffer_size bytes at a time and the
+    output is written in buffer_size blocks, so memory use is about
+    (k + 1) * buffer_size whatever the run length (external_sort keeps k
+    at most MAX_FAN_IN, see merge_passes).
+    """
+    code = typecode(dtype)
+    flush_items = max(1, buffer_size // array.array(code).itemsize)
+    with open(out_path, "wb") as out:
+        block = array.array(code)
+        for x in heapq.merge(*(read_values(path, dtype, buffer_size) for path in run_paths)):
+            block.append(x)
+            if len(block) >= flush_items:
+                block.tofile(out)
+                block = array.array(code)
+        block.tofile(out)
+
+def merge_passes(run_paths, run_dir, dtype=DTYPE, buffer_size=BUFFER_SIZE, max_fan_in=MAX_FAN_IN):
+    """Merges groups of max_fan_in runs into longer runs, pass after pass,
+    until at most max_fan_in are left; returns those run paths."""
+    merge_pass = 0
+    while len(run_paths) > max_fan_in:
+        merged_paths = []
+        for start in range(0, len(run_paths), max_fan_in):
+            group = run_paths[start:start + max_fan_in]
+            merged_path = os.path.join(run_dir, f"pass{merge_pass:02d}-run{len(merged_paths):05d}.bin")
+            merge_runs(group, merged_path, dtype, buffer_size)
+            # The merged runs are not needed again; free their disk space now
+            for path in group:
+                os.remove(path)
+            merged_paths.append(merged_path)
+        run_paths = merged_paths
+        merge_pass += 1
+    return run_paths
+
+def external_sort(in_path, out_path, sort_f, dtype=DTYPE, chunk_items=CHUNK_ITEMS, buffer_size=BUFFER_SIZE, tmp_dir=None,
+                  max_fan_in=MAX_FAN_IN):
+    """Sorts a binary integer file that may be far larger than RAM into
+    out_path. Returns the number of sorted runs that were merged."""
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        run_paths = sort_runs(in_path, run_dir, sort_f, dtype, chunk_items)
+        final_paths = merge_passes(run_paths, run_dir, dtype, buffer_size, max_fan_in)
+        merge_runs(final_paths, out_path, dtype, buffer_size)
+    return len(run_paths)
+
+# --- Benchmark ---
+
+def _benchmark_one(name, in_path, out_path, repeats):
+    """Times one algorithm on the file (in its own process, so its peak RSS
+    is not inflated by the runs before it)."""
+    sort_f = getattr(competition, name)
+    # One timed external sort per sample: no warm-up and no loop calibration,
+    # either of which would be another full, untimed pass over the file
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        external_sort(in_path, out_path, sort_f)
+        samples.append(time.perf_counter() - start)
+    return samples, harness.peak_rss(), is_sorted_file(out_path)
+
+def benchmark(names, in_path, work_dir, repeats=REPEATS):
+    """Returns {name: (samples, peak RSS, output sorted?)}."""
+    results = {}
+    # A fresh interpreter per algorithm gives a clean peak RSS
+    ctx = multiprocessing.get_context("spawn")
+    for name in names:
+        out_path = os.path.join(work_dir, f"sorted-{name}.bin")
+        with ctx.Pool(1) as pool:
+            results[name] = pool.apply(_benchmark_one, (name, in_path, out_path, repeats))
+        os.remove(out_path)
+    return results
+
+def print_results(results, file_bytes):
+    print("\n--- External Merge Sort ---")
+    header = f"{'CHUNK ALGORITHM':<24} | {'MEDIAN':<10} | {'THROUGHPUT':<12} | {'PEAK RSS':<10} | OK"
+    print("=" * len(header))
+    print(header)
+    print("=" * len(header))
+    for name, (samples, rss, ok) in results.items():
+        seconds = harness.summarize(samples)['median']
+        rss_text = harness.format_bytes(rss) if rss is not None else "-"
+        print(f"{name:<24} | {f'{seconds:.3f}s':<10} | {harness.format_throughput(file_bytes, seconds):<12} | "
+              f"{rss_text:<10} | {'yes' if ok else 'NO'}")
+    print("=" * len(header))
+
+
+if __name__ == "__main__":
+    print("=== External Merge Sort Benchmark ===")
+    with tempfile.TemporaryDirectory() as work_dir:
+        in_path = os.path.join(work_dir, "input.bin")
+        write_input_file(in_path, N_ITEMS, DTYPE, DISTRIBUTION, M, SEED)
+        file_bytes = os.path.getsize(in_path)
+        runs = -(-N_ITEMS // CHUNK_ITEMS)
+        merge_levels = 1
+        while runs > MAX_FAN_IN ** merge_levels:
+            merge_levels += 1
+        print(f"{N_ITEMS} {DTYPE} values ({harness.format_bytes(file_bytes)}, {DISTRIBUTION}), "
+              f"{runs} runs of {CHUNK_ITEMS}, {merge_levels} merge pass(es) of up to {MAX_FAN_IN} runs, "
+              f"{harness.format_bytes(BUFFER_SIZE)} buffers")
+        results = benchmark(ALGORITHMS, in_path, work_dir, REPEATS)
+
+    print_results(results, file_bytes)
+
+    if SAVE_RESULTS:
+        samples_by_key = {(f"External {name}", N_ITEMS, DISTRIBUTION): samples
+                          for name, (samples, _, _) in results.items()}
+        run_id = results_store.save_run("external_sort", samples_by_key)
+        print(f"\nResults saved as run {run_id} in {results_store.RESULTS_FILE}")
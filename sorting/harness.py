@@ -0,0 +1,227 @@
+import gc
+import itertools
+import math
+import sys
+import time
+import tracemalloc
+from statistics import NormalDist, median, quantiles
+
+# ==============================================================================
+# === HARNESS DEFAULTS ===
+# ==============================================================================
+# timed samples per algorithm
+REPEATS = 5
+
+# untimed runs before sampling (fills caches, settles the allocator)
+WARMUP = 1
+
+# tiny inputs are sorted in an inner loop until one sample takes this long (s)
+MIN_SAMPLE_TIME = 0.002
+
+# upper bound for the inner loop
+MAX_LOOPS = 10000
+
+# significance level for deciding a winner
+ALPHA = 0.05
+
+# the Mann-Whitney test enumerates every rank split (exact p-value) while
+# there are at most this many, and uses the normal approximation above
+EXACT_MAX_SPLITS = 20000
+# ==============================================================================
+
+
+# --- Input Staging ---
+
+def copy_input(l):
+    """Shallow copy of an input list (or array) for one sort to work on."""
+    # Lists of ints only need a shallow copy: the ints themselves are immutable
+    return l.copy() if hasattr(l, 'copy') else l[:]
+
+# --- Timing ---
+
+def _time_loops(sort_f, l, loops):
+    """Times `loops` sorts of fresh copies of l and returns the time per sort."""
+    # The copies are staged before the clock starts so only the sorts are timed
+    copies = [copy_input(l) for _ in range(loops)]
+    start = time.perf_counter()
+    for c in copies:
+        sort_f(c)
+    end = time.perf_counter()
+    return (end - start) / loops
+
+def calibrate_loops(sort_f, l, min_sample_time=MIN_SAMPLE_TIME):
+    """Picks an inner loop count so one sample lasts at least min_sample_time."""
+    single = _time_loops(sort_f, l, 1)
+    if single <= 0:
+        return MAX_LOOPS
+    return max(1, min(MAX_LOOPS, math.ceil(min_sample_time / single)))
+
+def measure(sort_f, l, repeats=REPEATS, warmup=WARMUP, min_sample_time=MIN_SAMPLE_TIME, totals=None):
+    """Returns `repeats` timing samples (seconds per sort) for sort_f on l.
+
+    The garbage collector is paused while sampling so collections triggered
+    by earlier allocations don't land inside a timed region. If a totals dict
+    is given, the time spent inside timed regions is added to totals['sort']
+    and everything else (warm-up, calibration, copying) to totals['overhead'].
+    """
+    wall_start = time.perf_counter()
+    for _ in range(warmup):
+        sort_f(copy_input(l))
+
+    loops = calibrate_loops(sort_f, l, min_sample_time)
+
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        samples = [_time_loops(sort_f, l, loops) for _ in range(repeats)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    if totals is not None:
+        wall = time.perf_counter() - wall_start
+        sort_time = sum(samples) * loops
+        totals['sort'] = totals.get('sort', 0.0) + sort_time
+        totals['overhead'] = totals.get('overhead', 0.0) + (wall - sort_time)
+    return samples
+
+# --- Memory ---
+
+def measure_peak_memory(sort_f, l):
+    """Peak memory (bytes) allocated while sort_f sorts one copy of l.
+
+    Runs separately from the timed samples because tracing every
+    allocation slows the sort down considerably.
+    """
+    l_to_sort = copy_input(l)
+    tracemalloc.start()
+    try:
+        sort_f(l_to_sort)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def peak_rss():
+    """Peak resident set size of this process so far, in bytes (None where
+    the resource module is unavailable, e.g. on Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def format_throughput(num_bytes, seconds):
+    """Bytes processed per second as 'x.x MB/s'."""
+    return f"{num_bytes / seconds / 2 ** 20:.1f} MB/s" if seconds > 0 else "- MB/s"
+
+def format_bytes(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+# --- Statistics ---
+
+def summarize(samples, confidence=0.95):
+    """Median, IQR and a distribution-free confidence interval for the median."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    if n >= 2:
+        q1, _, q3 = quantiles(ordered, n=4, method='inclusive')
+    else:
+        q1 = q3 = ordered[0]
+
+    # Order-statistic interval: ranks n/2 -/+ z*sqrt(n)/2
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * math.sqrt(n) / 2
+    lo = max(0, math.floor(n / 2 - half_width))
+    hi = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+
+    return {
+        'n': n,
+        'median': median(ordered),
+        'q1': q1,
+        'q3': q3,
+        'iqr': q3 - q1,
+        'ci_low': ordered[lo],
+        'ci_high': ordered[hi],
+    }
+
+def mann_whitney_p(a, b):
+    """Two-sided p-value of the Mann-Whitney U test: exact for small samples
+    (see EXACT_MAX_SPLITS), otherwise the tie-corrected normal approximation."""
+    n1, n2 = len(a), len(b)
+    combined = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+
+    # Average ranks over ties
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+
+    r1 = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+    n = n1 + n2
+    if math.comb(n, n1) <= EXACT_MAX_SPLITS:
+        # Share of all ways to pick n1 of the ranks that are at least as extreme
+        mean_r = n1 * (n + 1) / 2
+        observed = abs(r1 - mean_r) - 1e-9
+        splits = [abs(sum(split) - mean_r) >= observed for split in itertools.combinations(ranks, n1)]
+        return sum(splits) / len(splits)
+    var_u = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var_u <= 0:
+        return 1.0
+    z = (abs(u1 - mean_u) - 0.5) / math.sqrt(var_u)
+    return min(1.0, 2 * (1 - NormalDist().cdf(max(z, 0))))
+
+def smallest_p(n1, n2):
+    """Smallest p-value mann_whitney_p can return for samples of n1 and n2
+    (every sample of one faster than every sample of the other)."""
+    return mann_whitney_p(list(range(n1)), list(range(n1, n1 + n2)))
+
+def repeats_warning(repeats, alpha=ALPHA):
+    """Warning text if `repeats` samples per algorithm can never give a
+    significant win at alpha (every pair would be a tie), else None."""
+    p = smallest_p(repeats, repeats)
+    if p < alpha:
+        return None
+    return (f"Warning: with {repeats} samples per algorithm the smallest possible p-value is {p:.3f}, "
+            f"not below ALPHA = {alpha}; no win can be significant, raise REPEATS.")
+
+def decide_winner(samples_by_label, alpha=ALPHA):
+    """Returns the label with the lowest median if it is significantly faster than
+    every other label, otherwise None (no clear winner)."""
+    if not samples_by_label:
+        return None
+    ranked = sorted(samples_by_label, key=lambda label: median(samples_by_label[label]))
+    best = ranked[0]
+    for other in ranked[1:]:
+        if mann_whitney_p(samples_by_label[best], samples_by_label[other]) >= alpha:
+            return None
+    return best
+
+def format_overhead(totals):
+    """One-line text form of the sort time vs harness overhead totals."""
+    sort_time = totals.get('sort', 0.0)
+    overhead = totals.get('overhead', 0.0)
+    share = overhead / (sort_time + overhead) * 100 if sort_time + overhead else 0.0
+    return f"sort time {sort_time:.3f}s, harness overhead {overhead:.3f}s ({share:.1f}% of wall time)"
+
+def format_summary(stats):
+    """One-line text form of a summarize() result."""
+    return (f"median {stats['median']:.6f}s  IQR {stats['iqr']:.6f}s  "
+            f"95% CI [{stats['ci_low']:.6f}, {stats['ci_high']:.6f}]")
@@ -0,0 +1,180 @@
+import math
+import os
+import sys
+
+import harness
+
+# ==============================================================================
+# === INSTRUMENTATION ===
+# ==============================================================================
+# Opt-in operation counting. Nothing here touches the timed runs: the
+# counters come from one extra, untimed run of each algorithm on a wrapped
+# copy of its input, so normal runs pay nothing.
+#
+#   comparisons  order comparisons (<, <=, >, >=) between input values
+#   moves        element writes into the list being sorted and into buffers
+#                built with its type, type(a)(...) (swaps count 2)
+#
+# Work the wrappers can't see (C-level sorts like list.sort, lists of plain
+# int keys) is declared with @unobserved and reported as "-", not as 0.
+#   depth        deepest nesting of Python calls below the sort function
+#   blocks       peak number of extra live memory blocks (sys.getallocatedblocks)
+#   peak         peak traced memory in bytes (tracemalloc, separate run)
+
+# reference curves the counters are fitted against
+GROWTH_CURVES = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: n * n,
+}
+# ==============================================================================
+
+
+# --- Counting Wrappers ---
+
+_counts = {'comparisons': 0, 'moves': 0}
+
+class CountedInt(int):
+    """int whose order comparisons are counted."""
+    __slots__ = ()
+
+    def __lt__(self, other):
+        _counts['comparisons'] += 1
+        return int.__lt__(self, other)
+
+    def __le__(self, other):
+        _counts['comparisons'] += 1
+        return int.__le__(self, other)
+
+    def __gt__(self, other):
+        _counts['comparisons'] += 1
+        return int.__gt__(self, other)
+
+    def __ge__(self, other):
+        _counts['comparisons'] += 1
+        return int.__ge__(self, other)
+
+class CountingList(list):
+    """list whose element writes are counted."""
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            _counts['moves'] += len(value)
+        else:
+            _counts['moves'] += 1
+        list.__setitem__(self, index, value)
+
+def wrap(l):
+    """Instrumented copy of an input list."""
+    return CountingList(CountedInt(x) if isinstance(x, int) else x for x in l)
+
+def unobserved(*counters):
+    """Marks the counters a sort function's work is invisible to; they are
+    reported as "-" instead of an undercount."""
+    def mark(sort_f):
+        sort_f.unobserved = frozenset(counters)
+        return sort_f
+    return mark
+
+# --- Call Depth and Allocations ---
+
+_THIS_FILE = os.path.abspath(__file__)
+
+class _CallTracer:
+    """sys.setprofile hook tracking call depth and live memory blocks."""
+
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self.base_blocks = sys.getallocatedblocks()
+        self.max_blocks = 0
+
+    def __call__(self, frame, event, arg):
+        blocks = sys.getallocatedblocks() - self.base_blocks
+        if blocks > self.max_blocks:
+            self.max_blocks = blocks
+        # The counting wrappers above don't belong to the algorithm
+        if os.path.abspath(frame.f_code.co_filename) == _THIS_FILE:
+            return
+        if event == "call":
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+        elif event == "return":
+            self.depth -= 1
+
+def count_operations(sort_f, l):
+    """Sorts one instrumented copy of l and returns its counters
+    (see the table at the top of this file)."""
+    data = wrap(l)
+    tracer = _CallTracer()
+    _counts['comparisons'] = _counts['moves'] = 0
+    sys.setprofile(tracer)
+    try:
+        sort_f(data)
+    finally:
+        sys.setprofile(None)
+    hidden = getattr(sort_f, 'unobserved', ())
+    return {
+        'comparisons': None if 'comparisons' in hidden else _counts['comparisons'],
+        'moves': None if 'moves' in hidden else _counts['moves'],
+        'depth': tracer.max_depth,
+        'blocks': tracer.max_blocks,
+        'peak': harness.measure_peak_memory(sort_f, l),
+    }
+
+# --- Growth Fits ---
+
+def fit_growth(counts_by_n):
+    """Fits {N: count} to c * f(N) for every reference curve (least squares
+    on the relative error) and returns (curve name, c, RMS relative error)
+    of the best one, or None with fewer than two positive N."""
+    points = [(n, y) for n, y in sorted(counts_by_n.items()) if n > 1 and y > 0]
+    if len(points) < 2:
+        return None
+    best = None
+    for name, f in GROWTH_CURVES.items():
+        ratios = [y / f(n) for n, y in points]
+        # Minimises sum((c * f(n) - y)^2 / y^2)
+        c = sum(r ** -1 for r in ratios) / sum(r ** -2 for r in ratios)
+        error = math.sqrt(sum((c / r - 1) ** 2 for r in ratios) / len(ratios))
+        if best is None or error < best[2]:
+            best = (name, c, error)
+    return best
+
+def format_count(count):
+    return "-" if count is None else str(count)
+
+def format_fit(fit):
+    if fit is None:
+        return "-"
+    name, c, error = fit
+    return f"~{c:.3g}*{name} (+-{error * 100:.0f}%)"
+
+# --- Reporting ---
+
+def print_counter_table(counts, labels, Ns, title):
+    """counts is {N: {label: counters}}; one row per (N, algorithm)."""
+    print(f"\n--- {title} ---")
+    header = (f"{'N':<8} | {'ALGORITHM':<24} | {'COMPARISONS':>12} | {'MOVES':>12} | "
+              f"{'DEPTH':>5} | {'BLOCKS':>8} | {'PEAK':>10}")
+    print("=" * len(header))
+    print(header)
+    print("=" * len(header))
+    for n in Ns:
+        for label in labels:
+            c = counts.get(n, {}).get(label)
+            if c is None:
+                continue
+            print(f"{n:<8} | {label:<24} | {format_count(c['comparisons']):>12} | {format_count(c['moves']):>12} | "
+                  f"{c['depth']:>5} | {c['blocks']:>8} | {harness.format_bytes(c['peak']):>10}")
+    print("=" * len(header))
+
+    # Growth of each counter over N
+    for label in labels:
+        by_n = {n: counts[n][label] for n in Ns if label in counts.get(n, {})}
+        if len(by_n) < 2:
+            continue
+        fits = {key: format_fit(fit_growth({n: c[key] for n, c in by_n.items() if c[key] is not None}))
+                for key in ('comparisons', 'moves')}
+        print(f"{label:<24} comparisons {fits['comparisons']:<28} moves {fits['moves']}")
@@ -0,0 +1,96 @@
+import math
+
+# Note: the NumPy backends need numpy installed:
+# pip install numpy
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# --- NumPy Sorting Algorithm Definitions ---
+# Every function sorts a numpy array in place and returns it, like the list
+# based algorithms in competition.py. The `backend` attribute tells the
+# competition to hand them a numpy array instead of a list.
+
+def _backend(f):
+    f.backend = "numpy"
+    return f
+
+@_backend
+def np_quick_sort(a):
+    """np.sort's default introsort (quicksort that falls back to heapsort)."""
+    a.sort(kind='quicksort')
+    return a
+
+@_backend
+def np_merge_sort(a):
+    a.sort(kind='mergesort')
+    return a
+
+@_backend
+def np_heap_sort(a):
+    a.sort(kind='heapsort')
+    return a
+
+@_backend
+def np_stable_sort(a):
+    """Timsort, or radix sort for integer types of 16 bits or less."""
+    a.sort(kind='stable')
+    return a
+
+@_backend
+def np_counting_sort(a):
+    """Vectorized counting sort; memory grows with max(a) - min(a), not with max(a)."""
+    if a.size == 0: return a
+    offset = a.min()
+    counts = np.bincount((a - offset).astype(np.intp))
+    a[:] = np.repeat(np.arange(offset, offset + counts.size, dtype=a.dtype), counts)
+    return a
+
+RADIX_BITS = 8
+
+@_backend
+def np_radix_sort(a):
+    """Vectorized LSD radix sort on 8-bit digits.
+
+    Keys are mapped to unsigned integers (sign bit flipped) so negative
+    numbers sort correctly, then shifted down by their minimum so only the
+    digits that actually vary are processed. Each pass is a stable sort of
+    one byte, which numpy does with a counting sort.
+    """
+    if a.size < 2: return a
+    unsigned = np.dtype(f'u{a.dtype.itemsize}')
+    sign_bit = unsigned.type(1 << (8 * a.dtype.itemsize - 1))
+    keys = a.view(unsigned) ^ sign_bit
+    keys = keys - keys.min()
+
+    passes = math.ceil(int(keys.max()).bit_length() / RADIX_BITS)
+    order = np.arange(a.size)
+    mask = unsigned.type((1 << RADIX_BITS) - 1)
+    for p in range(passes):
+        digit = ((keys[order] >> unsigned.type(p * RADIX_BITS)) & mask).astype(np.uint8)
+        order = order[np.argsort(digit, kind='stable')]
+    a[:] = a[order]
+    return a
+
+NUMPY_SORTING_ALGORITHMS = {
+    'np1': ("NumPy Quick Sort", np_quick_sort),
+    'np2': ("NumPy Merge Sort", np_merge_sort),
+    'np3': ("NumPy Heap Sort", np_heap_sort),
+    'np4': ("NumPy Stable Sort", np_stable_sort),
+    'np5': ("NumPy Counting Sort", np_counting_sort),
+    'np6': ("NumPy Radix Sort", np_radix_sort),
+}
+
+# --- Input Helpers ---
+
+def is_numpy_sort(sort_f):
+    return getattr(sort_f, 'backend', None) == "numpy"
+
+def random_array(n, low, high, dtype="int64", seed=None):
+    """n random integers in [low, high] as a typed numpy array."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(low, high, size=n, endpoint=True, dtype=dtype)
+
+def to_array(l, dtype="int64"):
+    return np.array(l, dtype=dtype)
@@ -0,0 +1,147 @@
+import array
+import atexit
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+
+import harness
+
+# --- Parallel Merge Sort ---
+# The list is copied once into a shared memory block of int64s. Workers
+# attach to the block by name, so only (name, start, end) travels through
+# the pool: each worker sorts one partition in place, then sorted ranges are
+# merged pairwise, level by level (a tree merge), every merge of a level in
+# parallel, ping-ponging between the block and a second one of equal size.
+
+TYPECODE = "q"  # int64
+
+_pools = {}
+
+def get_pool(workers):
+    """Process pool with `workers` processes, created once and reused."""
+    if workers not in _pools:
+        # Workers must share this process's resource tracker; one started
+        # inside a worker would "clean up" blocks the parent already unlinked
+        resource_tracker.ensure_running()
+        _pools[workers] = multiprocessing.Pool(workers)
+    return _pools[workers]
+
+@atexit.register
+def close_pools():
+    for pool in _pools.values():
+        pool.close()
+        pool.join()
+    _pools.clear()
+
+def _sort_range(task):
+    """Worker: sorts block[start:end] in place with sort_f (None = list.sort)."""
+    name, start, end, sort_f = task
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast(TYPECODE)
+    try:
+        values = view[start:end].tolist()
+        if sort_f is None:
+            values.sort()
+        else:
+            values = sort_f(values)
+        view[start:end] = array.array(TYPECODE, values)
+    finally:
+        # The view must be released before the block can be closed
+        view.release()
+        shm.close()
+
+def _merge_ranges(task):
+    """Worker: merges the sorted ranges src[lo:mid] and src[mid:hi] into dst[lo:hi]."""
+    src_name, dst_name, lo, mid, hi = task
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    src_view, dst_view = src.buf.cast(TYPECODE), dst.buf.cast(TYPECODE)
+    try:
+        merged = src_view[lo:mid].tolist()
+        merged.extend(src_view[mid:hi].tolist())
+        # Timsort finds the two runs and merges them in one linear pass
+        merged.sort()
+        dst_view[lo:hi] = array.array(TYPECODE, merged)
+    finally:
+        src_view.release()
+        dst_view.release()
+        src.close()
+        dst.close()
+
+def parallel_sort(a, workers, sort_f=None):
+    """Sorts a list of int64-sized ints in place on `workers` processes.
+
+    a is split into `workers` partitions that are sorted in parallel with
+    sort_f (any list algorithm of competition.py; None = list.sort), then
+    merged pairwise in ceil(log2(workers)) parallel levels.
+    """
+    n = len(a)
+    if n < 2: return a
+    data = array.array(TYPECODE, a)
+    itemsize = data.itemsize
+    pool = get_pool(workers)
+
+    blocks = [shared_memory.SharedMemory(create=True, size=n * itemsize) for _ in range(2)]
+    try:
+        src, dst = blocks
+        src.buf[:n * itemsize] = data.tobytes()
+        del data
+
+        bounds = [n * i // workers for i in range(workers + 1)]
+        bounds = sorted(set(bounds))
+        pool.map(_sort_range, [(src.name, lo, hi, sort_f) for lo, hi in zip(bounds, bounds[1:])])
+
+        while len(bounds) > 2:
+            tasks, merged_bounds = [], [0]
+            for r in range(0, len(bounds) - 1, 2):
+                lo = bounds[r]
+                if r + 2 >= len(bounds):
+                    # Odd range out: carry it over to the other block
+                    dst.buf[lo * itemsize:n * itemsize] = src.buf[lo * itemsize:n * itemsize]
+                    merged_bounds.append(n)
+                    break
+                tasks.append((src.name, dst.name, lo, bounds[r + 1], bounds[r + 2]))
+                merged_bounds.append(bounds[r + 2])
+            pool.map(_merge_ranges, tasks)
+            src, dst = dst, src
+            bounds = merged_bounds
+
+        view = src.buf.cast(TYPECODE)
+        try:
+            a[:] = view[:n].tolist()
+        finally:
+            view.release()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return a
+
+def make_parallel_sort(workers, sort_f=None):
+    """parallel_sort with a fixed core count, usable like any sort_f."""
+    def sort(a):
+        return parallel_sort(a, workers, sort_f)
+    sort.__name__ = f"parallel_sort_{workers}"
+    return sort
+
+# --- Speedup Curve ---
+
+def speedup_curve(l, core_counts, sort_f=None, repeats=harness.REPEATS):
+    """{cores: timing samples} of parallel_sort on l for every core count."""
+    return {cores: harness.measure(make_parallel_sort(cores, sort_f), l, repeats=repeats)
+            for cores in core_counts}
+
+def print_speedup_table(curve, n, baselines):
+    """Parallel timings next to the single-threaded ones (baselines is
+    {label: median seconds} at the same N and input)."""
+    print(f"\n\n--- Parallel Merge Sort Speedup (N = {n}) ---")
+    header = f"{'CORES':<6} | {'MEDIAN':<12} | {'SPEEDUP':<8} | " + " | ".join(f"{'VS ' + label.upper():<22}" for label in baselines)
+    print("=" * len(header))
+    print(header)
+    print("=" * len(header))
+    first = harness.summarize(curve[min(curve)])['median']
+    for cores, samples in sorted(curve.items()):
+        median = harness.summarize(samples)['median']
+        versus = " | ".join(f"{f'{base / median:.2f}x':<22}" for base in baselines.values())
+        print(f"{cores:<6} | {f'{median:.6f}s':<12} | {f'{first / median:.2f}x':<8} | " + versus)
+    print("=" * len(header))
+    print(f"(speedup relative to {min(curve)} core(s); VS columns are the single-threaded algorithms)")
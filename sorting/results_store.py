@@ -0,0 +1,151 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import uuid
+
+import harness
+
+# Append-only JSON Lines file: one record per (run, algorithm, N, distribution)
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+# --- Environment ---
+
+def cpu_model():
+    """Best-effort CPU model name."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+def git_commit():
+    """Commit of the working tree the benchmark ran from (None outside git)."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu': cpu_model(),
+        'git_commit': git_commit(),
+    }
+
+def new_run_id():
+    return datetime.datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+# --- Reading and Writing ---
+
+def save_run(script, samples_by_key, path=RESULTS_FILE, run_id=None):
+    """Appends one run to the store.
+
+    samples_by_key maps (algorithm, n, distribution) to that combination's
+    timing samples. Returns the run id.
+    """
+    run_id = run_id or new_run_id()
+    header = {'run_id': run_id, 'time': datetime.datetime.now().isoformat(timespec='seconds'),
+              'script': script, **environment()}
+    with open(path, "a") as f:
+        for (algorithm, n, distribution), samples in samples_by_key.items():
+            if not samples:
+                continue
+            stats = harness.summarize(samples)
+            record = {**header, 'algorithm': algorithm, 'n': n, 'distribution': distribution,
+                      'samples': samples, **{k: stats[k] for k in ('median', 'iqr', 'ci_low', 'ci_high')}}
+            f.write(json.dumps(record) + "\n")
+    return run_id
+
+def load(path=RESULTS_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def run_ids(records):
+    """Run ids in the order they were written."""
+    return list(dict.fromkeys(r['run_id'] for r in records))
+
+# --- Regression Detection ---
+
+def compare(records, base_run, new_run, alpha=harness.ALPHA):
+    """Compares every (algorithm, N, distribution) measured in both runs.
+
+    Returns rows of (key, base median, new median, p-value, is_regression);
+    a regression is a slowdown that is significant at alpha.
+    """
+    base = {(r['algorithm'], r['n'], r['distribution']): r for r in records if r['run_id'] == base_run}
+    new = {(r['algorithm'], r['n'], r['distribution']): r for r in records if r['run_id'] == new_run}
+    rows = []
+    for key in sorted(base.keys() & new.keys(), key=lambda k: (k[2] or "", k[0], k[1])):
+        b, c = base[key], new[key]
+        p = harness.mann_whitney_p(b['samples'], c['samples'])
+        rows.append((key, b['median'], c['median'], p, c['median'] > b['median'] and p < alpha))
+    return rows
+
+def print_comparison(rows, base_run, new_run):
+    print(f"\n--- Comparison: {base_run} -> {new_run} ---")
+    header = f"{'ALGORITHM':<24} | {'N':<8} | {'DISTRIBUTION':<14} | {'BASE':<10} | {'NEW':<10} | {'CHANGE':<8} | P-VALUE"
+    print("=" * len(header))
+    print(header)
+    print("=" * len(header))
+    for (algorithm, n, distribution), base_median, new_median, p, regression in rows:
+        change = (new_median / base_median - 1) * 100 if base_median else 0.0
+        flag = "  <-- SLOWER" if regression else ""
+        print(f"{algorithm:<24} | {n:<8} | {str(distribution):<14} | {base_median:<10.6f} | "
+              f"{new_median:<10.6f} | {change:+7.1f}% | {p:.4f}{flag}")
+    print("=" * len(header))
+
+# --- Command Line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and compare stored sorting benchmark runs.")
+    parser.add_argument("--file", default=RESULTS_FILE, help="results store (JSON Lines)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="list stored runs")
+    cmp_parser = sub.add_parser("compare", help="flag significant slowdowns between two runs")
+    cmp_parser.add_argument("base", nargs="?", help="baseline run id (default: second to last run)")
+    cmp_parser.add_argument("new", nargs="?", help="run id to check (default: last run)")
+    cmp_parser.add_argument("--alpha", type=float, default=harness.ALPHA)
+    args = parser.parse_args(argv)
+
+    records = load(args.file)
+    ids = run_ids(records)
+
+    if args.command == "list":
+        for run_id in ids:
+            first = next(r for r in records if r['run_id'] == run_id)
+            count = sum(1 for r in records if r['run_id'] == run_id)
+            print(f"{run_id}  {first['time']}  {first['script']:<12} python {first['python']:<8} "
+                  f"git {first['git_commit'] or '-':<8} {count} results")
+        return 0
+
+    base_run = args.base or (ids[-2] if len(ids) >= 2 else None)
+    new_run = args.new or (ids[-1] if ids else None)
+    if base_run is None or new_run is None:
+        print("Need at least two stored runs to compare.")
+        return 2
+
+    rows = compare(records, base_run, new_run, args.alpha)
+    if not rows:
+        print(f"Runs {base_run} and {new_run} have no (algorithm, N, distribution) in common.")
+        return 2
+    print_comparison(rows, base_run, new_run)
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"{regressions} significant slowdown(s) at alpha = {args.alpha}")
+    # Non-zero exit status so scripts can fail on a regression
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import math
+import time
+
+import harness
+
+# ==============================================================================
+# === SWEEP DEFAULTS ===
+# ==============================================================================
+# seconds each algorithm may spend in the sweep
+BUDGET = 2.0
+
+# first N and the factor N grows by per step
+START_N = 8
+GROWTH = 2
+
+# N never grows past this (the input list has to fit in memory)
+MAX_N = 10 ** 7
+
+# timed samples per step (kept low: the fit smooths the noise out)
+REPEATS = 3
+
+# exponents of log n tried by the fit
+LOG_EXPONENTS = (0, 0.5, 1, 1.5, 2)
+
+# defaults for skipped_sizes (competition.py and each.py pass their own):
+# an algorithm sits out an N where it is predicted to be this many times
+# slower than another algorithm, or where one sort takes longer than SKIP_TIME (s)
+SKIP_FACTOR = 1000
+SKIP_TIME = 0.5
+
+# crossovers are searched for between these N
+SEARCH_RANGE = (4, 10 ** 9)
+# ==============================================================================
+
+
+# --- Budgeted Sweep ---
+
+def budget_sweep(sort_f, make_input, budget=BUDGET, start_n=START_N, growth=GROWTH, max_n=MAX_N, repeats=REPEATS):
+    """Times sort_f at N = start_n, start_n * growth, ... until the next step
+    would overrun the time budget (generating the input counts too). The
+    cost of the next step is predicted from how much the last one grew.
+    Returns [(N, median seconds), ...]."""
+    points = []
+    spent, last_cost, growth_ratio = 0.0, None, growth
+    n = start_n
+    while n <= max_n:
+        if last_cost is not None and spent + last_cost * growth_ratio > budget:
+            break
+        start = time.perf_counter()
+        l = make_input(n)
+        samples = harness.measure(sort_f, l, repeats=repeats)
+        cost = time.perf_counter() - start
+        points.append((n, harness.summarize(samples)['median']))
+        if last_cost:
+            growth_ratio = max(growth, cost / last_cost)
+        spent += cost
+        last_cost = cost
+        n = int(n * growth)
+    return points
+
+# --- Complexity Fit ---
+
+def fit_model(points):
+    """Fits t = a * n^b * (ln n)^c to [(n, t), ...].
+
+    log t = log a + b log n + c log log n is linear, but log n and log log n
+    are nearly collinear over a few decades of N, so c is chosen from
+    LOG_EXPONENTS and a, b are fitted by least squares for each; the c with
+    the smallest residual wins. Returns (a, b, c), or None with fewer than
+    two usable points.
+    """
+    points = [(n, t) for n, t in points if n >= 3 and t > 0]
+    if len(points) < 2:
+        return None
+    best = None
+    for c in LOG_EXPONENTS:
+        xs = [math.log(n) for n, _ in points]
+        ys = [math.log(t) - c * math.log(math.log(n)) for n, t in points]
+        x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+        sxx = sum((x - x_mean) ** 2 for x in xs)
+        b = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sxx if sxx else 0.0
+        log_a = y_mean - b * x_mean
+        residual = sum((log_a + b * x - y) ** 2 for x, y in zip(xs, ys))
+        if best is None or residual < best[0] - 1e-12:
+            best = (residual, (math.exp(log_a), b, c))
+    return best[1]
+
+def predict(model, n):
+    """Predicted seconds per sort at N."""
+    a, b, c = model
+    return a * n ** b * math.log(n) ** c
+
+def format_model(model):
+    if model is None:
+        return "-"
+    a, b, c = model
+    log_part = f" * log^{c:g} n" if c else ""
+    return f"{a:.3g} * n^{b:.2f}{log_part}"
+
+# --- Crossovers ---
+
+def crossover(model_1, model_2, factor=1.0, search_range=SEARCH_RANGE):
+    """Smallest N in search_range at which model_1 becomes `factor` times
+    slower than model_2 (model_1 / model_2 crosses factor from below).
+    Returns search_range[0] if it is already that much slower there and
+    None if it never gets there."""
+    def gap(log_n):
+        n = math.exp(log_n)
+        return math.log(predict(model_1, n)) - math.log(predict(model_2, n)) - math.log(factor)
+
+    lo, hi = (math.log(n) for n in search_range)
+    if gap(lo) >= 0:
+        return search_range[0]
+    # Coarse scan over powers of two, then bisection inside the bracket
+    steps = int((hi - lo) / math.log(2))
+    prev = lo
+    for i in range(1, steps + 1):
+        x = lo + i * (hi - lo) / steps
+        if gap(x) >= 0:
+            left, right = prev, x
+            for _ in range(50):
+                mid = (left + right) / 2
+                if gap(mid) >= 0:
+                    right = mid
+                else:
+                    left = mid
+            return math.ceil(math.exp(right))
+        prev = x
+    return None
+
+def skipped_sizes(models, Ns, factor=SKIP_FACTOR, max_time=SKIP_TIME):
+    """{label: set of N} each algorithm is not worth running at: the N where
+    it is predicted `factor` times slower than the fastest other algorithm
+    or a single sort takes longer than max_time. Decided N by N, since an
+    algorithm that is behind at small N (counting sort's O(n + M)) can lead
+    at large N. Labels without a fitted model are never skipped."""
+    skipped = {}
+    for n in Ns:
+        if n < 3:
+            continue
+        predicted = {label: predict(model, n) for label, model in models.items() if model is not None}
+        for label, t in predicted.items():
+            others = [other_t for other, other_t in predicted.items() if other != label]
+            if t > max_time or (others and t > factor * min(others)):
+                skipped.setdefault(label, set()).add(n)
+    return skipped
+
+# --- Reporting ---
+
+def fit_models(sort_funcs, labels, make_input, budget=BUDGET):
+    """Runs the budgeted sweep for every algorithm; returns {label: model}
+    and {label: [(N, seconds), ...]}."""
+    models, points_by_label = {}, {}
+    for sort_f, label in zip(sort_funcs, labels):
+        points = budget_sweep(sort_f, make_input, budget)
+        points_by_label[label] = points
+        models[label] = fit_model(points)
+        reached = points[-1][0] if points else 0
+        print(f"  {label:<24} up to N = {reached:<9} {format_model(models[label])}")
+    return models, points_by_label
+
+def print_crossovers(models, points_by_label, skipped):
+    """Crossover N of every pair of algorithms (where the faster one
+    changes), searched only inside the N both were measured at, and the
+    N each algorithm sits out (see skipped_sizes)."""
+    labels = [label for label, model in models.items() if model is not None]
+    print("\n--- Predicted Crossovers ---")
+    for i, first in enumerate(labels):
+        for second in labels[i + 1:]:
+            lo = max(points_by_label[first][0][0], points_by_label[second][0][0])
+            hi = min(points_by_label[first][-1][0], points_by_label[second][-1][0])
+            if hi <= lo:
+                continue
+            n1 = crossover(models[first], models[second], search_range=(lo, hi))
+            n2 = crossover(models[second], models[first], search_range=(lo, hi))
+            # Report where the one that is faster at small N falls behind
+            if n1 is not None and n1 > lo:
+                print(f"  {first} falls behind {second} from N ~ {n1}")
+            elif n2 is not None and n2 > lo:
+                print(f"  {second} falls behind {first} from N ~ {n2}")
+            else:
+                faster, slower = (second, first) if n1 == lo else (first, second)
+                print(f"  {faster} is faster than {slower} at every N from {lo} to {hi}")
+    for label, sizes in skipped.items():
+        print(f"  {label} sits out N = {', '.join(str(n) for n in sorted(sizes))}")